@@ -0,0 +1,104 @@
+# Pipeline de agregação dos bens declarados
+# Regenera os arquivos base_dashboard/bens_{pref,vice,vereador}_agregado_*.csv a partir dos
+# arquivos brutos do TSE (consulta_cand e bem_candidato, nacional ou por UF). Os de 2024
+# ficam direto em base_dashboard; os das outras eleições, em base_dashboard/<ano>.
+# Uso: python agregar_bens.py --dados pasta_tse [--ano 2024] [--saida pasta] [--processos 4]
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pandas as pd
+
+from leitura_tse import (
+    ANO_ELEICAO, CHAVE_CANDIDATO, PADRAO_BENS, PADRAO_CANDIDATOS, TAMANHO_BLOCO,
+    arquivos_tse, ler_candidatos, totais_bens,
+)
+
+# Colunas do arquivo de candidatos usadas nos agregados
+COLUNAS_CANDIDATOS = [CHAVE_CANDIDATO, 'DS_CARGO', 'DS_COR_RACA', 'DS_GENERO', 'SG_PARTIDO', 'SG_UF']
+
+PASTA_AGREGADOS = 'base_dashboard'
+
+# Prefixo dos arquivos por cargo
+CARGOS = {'PREFEITO': 'pref', 'VICE-PREFEITO': 'vice', 'VEREADOR': 'vereador'}
+
+# Sufixo dos arquivos e colunas de agrupamento
+AGRUPAMENTOS = {
+    'cor': ['DS_COR_RACA'],
+    'genero': ['DS_GENERO'],
+    'partido': ['SG_PARTIDO'],
+    'cor_genero': ['DS_COR_RACA', 'DS_GENERO'],
+    'genero_partido': ['DS_GENERO', 'SG_PARTIDO'],
+}
+
+
+def pasta_agregados(ano=ANO_ELEICAO):
+    return PASTA_AGREGADOS if ano == ANO_ELEICAO else os.path.join(PASTA_AGREGADOS, str(ano))
+
+
+def arquivo_agregado(prefixo, sufixo, ano=ANO_ELEICAO):
+    # Ex.: arquivo_agregado('vereador', 'cor', 2020) -> base_dashboard/2020/bens_vereador_agregado_cor.csv
+    return os.path.join(pasta_agregados(ano), f'bens_{prefixo}_agregado_{sufixo}.csv')
+
+
+def bens_por_candidato(dados, ano=ANO_ELEICAO, processos=None, tamanho_bloco=TAMANHO_BLOCO):
+    # Lê candidatos e bens de todas as partições (UFs) em paralelo e junta pela chave
+    # do candidato. Retorna uma linha por candidato com bens declarados.
+    arquivos_candidatos = list(arquivos_tse(dados, PADRAO_CANDIDATOS, ano).values())
+    arquivos_bens = list(arquivos_tse(dados, PADRAO_BENS, ano).values())
+    if not arquivos_candidatos or not arquivos_bens:
+        raise FileNotFoundError(f'Arquivos de candidatos ou de bens de {ano} não encontrados em {dados}')
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        candidatos = executor.map(
+            partial(ler_candidatos, colunas=COLUNAS_CANDIDATOS, tamanho_bloco=tamanho_bloco),
+            arquivos_candidatos,
+        )
+        bens = executor.map(partial(totais_bens, tamanho_bloco=tamanho_bloco), arquivos_bens)
+        candidatos = pd.concat(list(candidatos), ignore_index=True)
+        bens = pd.concat(list(bens))
+
+    # Um mesmo candidato pode ter bens em mais de uma partição: recombina as reduções
+    bens = bens.groupby(level=0).agg({'total': 'sum', 'itens': 'sum', 'maior': 'max'})
+
+    df = candidatos.merge(bens, left_on=CHAVE_CANDIDATO, right_index=True, how='inner')
+    df = df.rename(columns={'total': 'VR_BEM_CANDIDATO'})
+    return df.sort_values(CHAVE_CANDIDATO, kind='stable').reset_index(drop=True)
+
+
+def agregar(df, colunas):
+    # Contagem, soma, média e mediana (exata) dos bens por candidato no agrupamento
+    return df.groupby(colunas)['VR_BEM_CANDIDATO'].agg(['count', 'sum', 'mean', 'median'])
+
+
+def gerar_agregados(df, saida):
+    # Todos os agregados saem da mesma tabela de bens por candidato, lida uma única vez
+    os.makedirs(saida, exist_ok=True)
+    caminhos = []
+    for cargo, prefixo in CARGOS.items():
+        df_cargo = df[df['DS_CARGO'] == cargo]
+        for sufixo, colunas in AGRUPAMENTOS.items():
+            caminho = os.path.join(saida, f'bens_{prefixo}_agregado_{sufixo}.csv')
+            agregar(df_cargo, colunas).to_csv(caminho)
+            caminhos.append(caminho)
+    return caminhos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenera os agregados de bens declarados do dashboard')
+    parser.add_argument('--dados', default='.', help='pasta com os arquivos brutos do TSE')
+    parser.add_argument('--saida', help='pasta de destino dos CSVs (padrão: a pasta do ano)')
+    parser.add_argument('--ano', type=int, default=ANO_ELEICAO)
+    parser.add_argument('--processos', type=int, default=None, help='processos em paralelo (padrão: núcleos)')
+    parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO, help='linhas por bloco de leitura')
+    args = parser.parse_args()
+
+    df = bens_por_candidato(args.dados, args.ano, args.processos, args.bloco)
+    for caminho in gerar_agregados(df, args.saida or pasta_agregados(args.ano)):
+        print(caminho)
+
+
+if __name__ == '__main__':
+    main()
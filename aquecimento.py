@@ -0,0 +1,81 @@
+# Pré-carregamento da base compartilhada
+# Abre a base de candidatos e monta índice, cubo, facetas, motor de percentis, tabela
+# paginada, busca por nome e ranking de bens (todos em st.cache_resource) e calcula as
+# visões sem filtro de cada página, para que o primeiro usuário não pague por isso.
+# Das outras eleições disponíveis só os cubos de contagens são montados (usados nas
+# comparações entre anos), fora do orçamento de partida.
+# No servidor roda em uma thread, disparada uma vez por processo: na partida, com
+# servidor.py; com `streamlit run`, só na primeira execução do ponto de entrada.
+# Uso: python aquecimento.py  (gera a base e os arrays derivados antes de subir o servidor
+# e sai com erro se o tempo passar do orçamento de partida)
+
+import logging
+import sys
+import threading
+import time
+
+from desempenho import ORCAMENTO_PARTIDA, verificar_orcamento
+
+logger = logging.getLogger(__name__)
+
+_trava = threading.Lock()
+_iniciado = False
+
+
+def aquecer():
+    # Importações aqui dentro: o ponto de entrada não paga por elas antes de desenhar a página
+    from busca_nomes import carregar_busca
+    from cache_resultados import resultado_filtros
+    from cubo_contagens import carregar_cubo
+    from facetas import carregar_facetas
+    from indice_filtros import carregar_indice
+    from pagina_cargo import PAGINAS_CARGO
+    from percentis_bens import carregar_motor_percentis
+    from ranking_bens import carregar_ranking
+    from tabela_paginada import carregar_tabela
+
+    inicio = time.perf_counter()
+    carregar_indice()
+    carregar_cubo()
+    carregar_facetas()
+    carregar_motor_percentis()
+    carregar_tabela()
+    carregar_busca()
+    carregar_ranking()
+    for cargo in PAGINAS_CARGO:
+        resultado_filtros({'Cargo': [cargo]})
+    return time.perf_counter() - inicio
+
+
+def aquecer_outros_anos():
+    from base_candidatos import anos_disponiveis
+    from cubo_contagens import carregar_cubo
+    from leitura_tse import ANO_ELEICAO
+
+    for ano in anos_disponiveis():
+        if ano != ANO_ELEICAO:
+            carregar_cubo(ano)
+
+
+def _aquecer_em_segundo_plano():
+    try:
+        verificar_orcamento('aquecimento', aquecer(), ORCAMENTO_PARTIDA)
+        aquecer_outros_anos()
+    except FileNotFoundError as erro:
+        logger.warning('Aquecimento ignorado: %s', erro)
+
+
+def iniciar_aquecimento():
+    # Uma única thread por processo, não importa quantas sessões chamem
+    global _iniciado
+    with _trava:
+        if _iniciado:
+            return
+        _iniciado = True
+    threading.Thread(target=_aquecer_em_segundo_plano, name='aquecimento', daemon=True).start()
+
+
+if __name__ == '__main__':
+    segundos = aquecer()
+    print(f'Base carregada em {segundos:.2f} s (orçamento: {ORCAMENTO_PARTIDA:.2f} s)')
+    sys.exit(0 if segundos <= ORCAMENTO_PARTIDA else 1)
@@ -0,0 +1,253 @@
+# Atualização incremental da base quando o TSE republica o arquivo de candidatos
+# Cada linha gravada tem uma impressão digital: a chave SQ_CANDIDATO e o hash do
+# conteúdo (incluindo os totais de bens). O arquivo novo é comparado com o retrato
+# anterior e só as candidaturas inseridas, alteradas e removidas são aplicadas:
+#   - tabela: as removidas saem, as alteradas são trocadas no lugar e as inseridas vão
+#     para o fim da sua partição (a tabela continua agrupada por cargo e UF); os dicionários das
+#     categóricas só ganham valores novos no fim, então os códigos das linhas que ficaram
+#     não mudam;
+#   - índices dos filtros: as listas de linhas são corrigidas por diferença, sem reordenar;
+#   - agregados de bens (base_dashboard/bens_*_agregado_*.csv): contagem e soma recebem a
+#     diferença e a mediana é recalculada só nos grupos que mudaram. Os agregados precisam
+#     ter sido gerados do mesmo retrato (agregar_bens.py sobre os arquivos anteriores).
+# Os demais arrays derivados (postos, busca) são refeitos na próxima abertura da base ou
+# no aquecimento; servidores já em pé seguem com a versão anterior até reiniciar.
+# Sem retrato anterior (base inexistente ou gerada por versão antiga, fora da ordem de
+# cargo e UF), ou se o arquivo novo mudou de colunas, faz a conversão completa.
+# Candidatos e bens podem ser o arquivo nacional ou a pasta com os arquivos por UF; sem
+# eles, os arquivos, a base e os agregados são os da eleição de --ano.
+# Uso: python atualizar_base.py [--ano 2024] [--candidatos arquivo.csv|pasta] [--bens arquivo.csv|pasta]
+#                               [--base pasta] [--agregados pasta] [--processos 4]
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from agregar_bens import AGRUPAMENTOS, CARGOS, PASTA_AGREGADOS, pasta_agregados
+from base_candidatos import (
+    ARQUIVO_BENS, ARQUIVO_IMPRESSOES, ARQUIVO_ITENS_BENS, ARQUIVO_TABELA, ARQUIVO_TSE, COLUNAS_TSE,
+    PASTA_BASE, BaseCandidatos, arquivos_eleicao, arquivos_origem, assinatura_arquivos, codigos_particao,
+    converter_base, gravar_impressoes, gravar_itens_bens, gravar_tabela, impressoes, ler_itens_bens,
+    preparar_candidatos, tabela_arrow, totais_itens,
+)
+from indice_filtros import CAMPOS_FILTRO, VERSAO_INDICE, IndiceFiltros
+from leitura_tse import ANO_ELEICAO, CHAVE_CANDIDATO, PADRAO_BENS
+from metricas import medir
+
+
+def comparar_impressoes(chaves_antigas, hashes_antigos, chaves_novas, hashes_novos):
+    # Retorna (removidas, alteradas_antigas, alteradas_novas, inseridas): posições na
+    # tabela anterior (removidas, alteradas_antigas) e no arquivo novo (as outras duas);
+    # alteradas_antigas[i] e alteradas_novas[i] são a mesma candidatura
+    ordem = np.argsort(chaves_antigas, kind='stable')
+    ordenadas = chaves_antigas[ordem]
+    posicoes = np.minimum(np.searchsorted(ordenadas, chaves_novas), max(len(ordenadas) - 1, 0))
+    existe = ordenadas[posicoes] == chaves_novas if len(ordenadas) else np.zeros(len(chaves_novas), dtype=bool)
+    antigas = ordem[posicoes]
+
+    alteradas_novas = np.flatnonzero(existe & (hashes_antigos[antigas] != hashes_novos))
+    presentes = np.zeros(len(chaves_antigas), dtype=bool)
+    presentes[antigas[existe]] = True
+    return np.flatnonzero(~presentes), antigas[alteradas_novas], alteradas_novas, np.flatnonzero(~existe)
+
+
+def atualizar_indice(codigos, linhas_antigas, novo_id, trocadas, n_categorias):
+    # Índice de um campo por diferença. codigos: códigos (+1) da tabela nova;
+    # linhas_antigas: listas do índice anterior; novo_id: id novo de cada linha antiga
+    # (-1 para removidas e alteradas); trocadas: ids novos das alteradas e inseridas.
+    # As linhas que ficaram continuam em ordem (código, id) depois da renumeração, então
+    # as trocadas entram por busca binária na chave código * n + id
+    linhas = novo_id[linhas_antigas]
+    linhas = linhas[linhas >= 0]
+    n = len(codigos)
+    chaves = codigos[linhas].astype(np.int64) * n + linhas
+    chaves_trocadas = codigos[trocadas].astype(np.int64) * n + trocadas
+    ordem = np.argsort(chaves_trocadas)
+    linhas = np.insert(linhas, np.searchsorted(chaves, chaves_trocadas[ordem]), trocadas[ordem])
+    contagem = np.bincount(codigos, minlength=n_categorias + 1)
+    return {'codigos': codigos, 'linhas': linhas, 'inicios': np.concatenate([[0], np.cumsum(contagem)])}
+
+
+def linhas_com_bens(df, cargo):
+    return df[(df['Cargo'] == cargo) & df['Total de Bens'].notna()]
+
+
+def contribuicao(df, colunas, medidas=('count', 'sum')):
+    # Medidas dos bens por grupo, com os grupos como texto (o formato dos CSVs)
+    chaves = [df[coluna].astype(str) for coluna in colunas]
+    return df.groupby(chaves)['Total de Bens'].agg(list(medidas))
+
+
+def atualizar_agregado(agregado, sai, entra, linhas_cargo, colunas):
+    # agregado: CSV anterior (índice = colunas do agrupamento); sai/entra: contribuições
+    # das linhas antigas que saíram e das novas que entraram; linhas_cargo: linhas do
+    # cargo com bens declarados na tabela nova (categóricas)
+    novo = agregado[['count', 'sum']].add(entra, fill_value=0).sub(sai, fill_value=0)
+    novo = novo[novo['count'] > 0].sort_index()
+    novo['count'] = novo['count'].round().astype(np.int64)
+    novo['mean'] = novo['sum'] / novo['count']
+    novo['median'] = agregado['median'].reindex(novo.index)
+
+    # Mediana exata só dos grupos que mudaram, sobre as linhas da tabela nova
+    mudaram = sai.index.union(entra.index).intersection(novo.index)
+    if len(mudaram):
+        # A seleção compara pelos códigos das categóricas; só os grupos escolhidos viram texto
+        chaves = pd.MultiIndex.from_arrays([linhas_cargo[coluna] for coluna in colunas])
+        if len(colunas) == 1:
+            chaves = chaves.get_level_values(0)
+        df = linhas_cargo[chaves.isin(mudaram)]
+        medianas = contribuicao(df, colunas, ['median'])['median']
+        novo.loc[medianas.index, 'median'] = medianas
+    return novo[['count', 'sum', 'mean', 'median']]
+
+
+def atualizar_agregados(pasta, antes, depois, base):
+    # antes: linhas antigas que saíram (removidas e versão anterior das alteradas);
+    # depois: linhas novas que entraram; base: a base já atualizada
+    caminhos = []
+    dimensoes = sorted({COLUNAS_TSE[coluna] for colunas in AGRUPAMENTOS.values() for coluna in colunas})
+    tabela = base.colunas_pandas(dimensoes + ['Cargo', 'Total de Bens'])
+    for cargo, prefixo in CARGOS.items():
+        linhas_cargo = linhas_com_bens(tabela, cargo)
+        for sufixo, colunas_tse in AGRUPAMENTOS.items():
+            caminho = os.path.join(pasta, f'bens_{prefixo}_agregado_{sufixo}.csv')
+            if not os.path.exists(caminho):
+                continue
+            colunas = [COLUNAS_TSE[coluna] for coluna in colunas_tse]
+            agregado = pd.read_csv(caminho, index_col=list(range(len(colunas))), dtype={c: str for c in colunas_tse})
+            sai = contribuicao(linhas_com_bens(antes, cargo), colunas)
+            entra = contribuicao(linhas_com_bens(depois, cargo), colunas)
+            if sai.empty and entra.empty:
+                continue
+            sai.index.names = entra.index.names = agregado.index.names
+            atualizar_agregado(agregado, sai, entra, linhas_cargo, colunas).to_csv(caminho)
+            caminhos.append(caminho)
+    return caminhos
+
+
+def atualizar(origem=ARQUIVO_TSE, destino=PASTA_BASE, arquivo_bens=ARQUIVO_BENS, pasta_agregados=PASTA_AGREGADOS,
+              processos=None, ano=ANO_ELEICAO):
+    # Retorna o número de candidaturas inseridas, alteradas e removidas
+    # (ou None quando foi preciso converter tudo)
+    caminho_impressoes = os.path.join(destino, ARQUIVO_IMPRESSOES)
+    if not os.path.exists(os.path.join(destino, ARQUIVO_TABELA)) or not os.path.exists(caminho_impressoes):
+        converter_base(origem, destino, arquivo_bens, processos, ano)
+        return None
+
+    base = BaseCandidatos(destino)
+    if base.particoes() is None:
+        converter_base(origem, destino, arquivo_bens, processos, ano)
+        return None
+    anterior = np.load(caminho_impressoes)
+
+    # Os bens item a item só são relidos do CSV se os arquivos não são os da última
+    # gravação; os totais por candidato saem da tabela item a item, como na conversão completa
+    totais = None
+    arquivos_bens = arquivos_origem(arquivo_bens, PADRAO_BENS, ano)
+    if arquivos_bens:
+        mesmos_arquivos = 'bens' in anterior.files and np.array_equal(anterior['bens'], assinatura_arquivos(arquivos_bens))
+        if not mesmos_arquivos or not os.path.exists(os.path.join(destino, ARQUIVO_ITENS_BENS)):
+            with medir('atualização: bens item a item'):
+                gravar_itens_bens(arquivos_bens, destino, processos)
+        totais = totais_itens(ler_itens_bens(destino))
+
+    df = preparar_candidatos(origem, totais, processos, ano)
+    with medir('atualização: impressões'):
+        chaves = df[CHAVE_CANDIDATO].to_numpy(np.int64)
+        hashes = impressoes(df)
+        diferenca = comparar_impressoes(anterior['chaves'], anterior['hashes'], chaves, hashes)
+    removidas, alteradas_antigas, alteradas_novas, inseridas = diferenca
+
+    resumo = {'inseridas': len(inseridas), 'alteradas': len(alteradas_novas), 'removidas': len(removidas)}
+    if not any(resumo.values()):
+        # Só renova o retrato e a data da tabela, para a base não ser dada como desatualizada
+        gravar_impressoes(anterior['chaves'], anterior['hashes'], destino, arquivos_bens)
+        os.utime(os.path.join(destino, ARQUIVO_TABELA))
+        return resumo
+
+    entram = np.concatenate([alteradas_novas, inseridas])
+    delta = tabela_arrow(df.iloc[entram].reset_index(drop=True))
+    if len(np.unique(chaves)) != len(chaves) or not delta.schema.equals(base.tabela.schema):
+        # Chaves repetidas ou colunas diferentes: o retrato anterior não serve de referência
+        converter_base(origem, destino, arquivo_bens, processos, ano)
+        return None
+
+    # Índices anteriores: montados agora se ainda não existiam
+    indice = IndiceFiltros(base)
+    antes = base.linhas(np.concatenate([removidas, alteradas_antigas]))
+
+    with medir('atualização: tabela'):
+        n = len(base)
+        manter = np.ones(n, dtype=bool)
+        manter[removidas] = False
+        # Posição, na tabela base + delta, de cada linha da tabela nova
+        origem_linhas = np.arange(n)
+        origem_linhas[alteradas_antigas] = n + np.arange(len(alteradas_novas))
+        posicoes = np.concatenate([origem_linhas[manter], n + len(alteradas_novas) + np.arange(len(inseridas))])
+
+        # unify_dictionaries mantém o dicionário da tabela anterior e acrescenta os valores novos
+        juntas = pa.concat_tables([base.tabela, delta]).unify_dictionaries()
+        # Reagrupa por cargo e UF: as linhas que ficaram mantêm a ordem e as inseridas vão
+        # para o fim da sua partição (uma alterada que mudou de partição também muda de lugar)
+        particao = codigos_particao(juntas)
+        posicoes = posicoes[np.argsort(particao[posicoes], kind='stable')]
+
+        # Id novo de cada linha da tabela base + delta (-1 se não entra na tabela nova)
+        destino_linhas = np.full(len(juntas), -1)
+        destino_linhas[posicoes] = np.arange(len(posicoes))
+        novo_id, trocadas = destino_linhas[:n], destino_linhas[n:]
+        if np.any(np.diff(novo_id[novo_id >= 0]) <= 0):
+            # Base anterior fora da ordem das partições: a correção dos índices não vale
+            converter_base(origem, destino, arquivo_bens, processos, ano)
+            return None
+
+        gravar_tabela(juntas.take(pa.array(posicoes)), destino)
+        gravar_impressoes(
+            np.concatenate([anterior['chaves'], chaves[entram]])[posicoes],
+            np.concatenate([anterior['hashes'], hashes[entram]])[posicoes],
+            destino, arquivos_bens,
+        )
+
+    with medir('atualização: índices'):
+        nova = BaseCandidatos(destino)
+        for campo in CAMPOS_FILTRO:
+            codigos = (nova.codigos(campo) + 1).astype(np.int32)
+            arrays = atualizar_indice(codigos, indice.linhas[campo], novo_id, trocadas, len(nova.categorias(campo)))
+            nova.gravar_derivado(f'indice {campo}', arrays, VERSAO_INDICE)
+
+    if os.path.isdir(pasta_agregados) and 'Total de Bens' in nova.columns:
+        with medir('atualização: agregados'):
+            atualizar_agregados(pasta_agregados, antes, df.iloc[entram], nova)
+    return resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Aplica à base só as mudanças do arquivo republicado pelo TSE')
+    parser.add_argument('--ano', type=int, default=ANO_ELEICAO)
+    parser.add_argument('--candidatos', help='arquivo de candidatos do TSE (ou pasta por UF)')
+    parser.add_argument('--bens', help='arquivo de bens do TSE (ou pasta por UF)')
+    parser.add_argument('--base', help='pasta da base convertida')
+    parser.add_argument('--agregados', help='pasta dos agregados de bens')
+    parser.add_argument('--processos', type=int, default=None, help='processos na leitura dos arquivos por UF')
+    args = parser.parse_args()
+
+    candidatos, bens, base = arquivos_eleicao(args.ano)
+    inicio = time.perf_counter()
+    resumo = atualizar(
+        args.candidatos or candidatos, args.base or base, args.bens or bens,
+        args.agregados or pasta_agregados(args.ano), args.processos, args.ano,
+    )
+    segundos = time.perf_counter() - inicio
+    if resumo is None:
+        print(f'Sem retrato anterior utilizável: base convertida por completo em {segundos:.1f} s')
+    else:
+        print(f"{resumo['inseridas']} inseridas, {resumo['alteradas']} alteradas, "
+              f"{resumo['removidas']} removidas em {segundos:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,469 @@
+# Base colunar de candidatos
+# Converte os arquivos de candidatos do TSE uma única vez para uma tabela Arrow (formato
+# IPC, sem compressão), mantendo só as colunas usadas no dashboard e com as colunas de
+# baixa cardinalidade codificadas como dicionário.
+# A origem pode ser o arquivo nacional (consulta_cand_2024_BRASIL.csv, lido pelo leitor
+# multithread do Arrow) ou os arquivos por UF (consulta_cand_2024_SP.csv, ..., um processo
+# por arquivo): basta passar a pasta. Se o arquivo nacional não existe, os arquivos por UF
+# da mesma pasta são usados.
+# A base é particionada por ano, cargo e UF: cada eleição tem a sua pasta
+# (base_dashboard/candidatos_<ano>, só aberta quando o ano é escolhido) e, dentro dela,
+# as linhas ficam agrupadas por cargo e UF, com o intervalo de linhas de cada partição nos
+# metadados da tabela ('particoes'). Filtros de cargo e UF leem só as partições que casam.
+# Os bens (bem_candidato_2024_*.csv) são lidos uma vez, em lotes, para uma segunda
+# tabela item a item (bens.arrow, usada no detalhamento); os totais por candidato saem
+# dela e são juntados na conversão, pela chave SQ_CANDIDATO, e não a cada execução.
+#
+# A tabela e os arrays derivados (índices, postos de ordenação) são abertos por
+# mapeamento de memória: todas as sessões e todos os processos do servidor leem as
+# mesmas páginas do arquivo, e as linhas só viram DataFrame na hora de exibir.
+# Quando o TSE republica o arquivo, atualizar_base.py aplica só as diferenças à base.
+# Uso: python base_candidatos.py [arquivo_tse.csv|pasta] [pasta_destino] [arquivo_bens.csv|pasta]
+#                               [--ano 2024] [--processos 4]
+
+import argparse
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import streamlit as st
+
+from leitura_tse import (
+    ANO_ELEICAO, ANOS_ELEICOES, CHAVE_CANDIDATO, PADRAO_BENS, PADRAO_CANDIDATOS, VALOR_AUSENTE, arquivos_tse,
+    ler_particoes, lotes_particoes, normalizar_texto,
+)
+from metricas import medir
+
+# Arquivos brutos do TSE e pasta da base convertida
+ARQUIVO_TSE = PADRAO_CANDIDATOS.format(ano=ANO_ELEICAO, uf='BRASIL')
+ARQUIVO_BENS = PADRAO_BENS.format(ano=ANO_ELEICAO, uf='BRASIL')
+PASTA_BASE = f'base_dashboard/candidatos_{ANO_ELEICAO}'
+ARQUIVO_TABELA = 'tabela.arrow'
+ARQUIVO_ITENS_BENS = 'bens.arrow'
+ARQUIVO_IMPRESSOES = 'impressoes.npz'
+
+# Colunas do TSE usadas no dashboard e seus nomes de exibição
+COLUNAS_TSE = {
+    'NM_URNA_CANDIDATO': 'Nome',
+    'DS_COR_RACA': 'Cor',
+    'DS_OCUPACAO': 'Profissão',
+    'DS_GRAU_INSTRUCAO': 'Grau de Instrução',
+    'DS_GENERO': 'Gênero',
+    'SG_PARTIDO': 'Partido',
+    'NM_UE': 'Cidade',
+    'SG_UF': 'UF',
+    'DS_CARGO': 'Cargo',
+}
+
+# Colunas lidas só se existirem no arquivo (o nome completo não vem em todas as versões)
+COLUNAS_TSE_OPCIONAIS = {'NM_CANDIDATO': 'Nome Completo'}
+
+# Colunas de baixa cardinalidade guardadas como categóricas
+COLUNAS_CATEGORICAS = ['Cor', 'Gênero', 'Partido', 'Cidade', 'UF', 'Cargo']
+
+# Campos de partição das linhas dentro da base de um ano (nessa ordem)
+CAMPOS_PARTICAO = ['Cargo', 'UF']
+
+# Colunas de bens por candidato, juntadas na conversão
+COLUNAS_BENS = {'total': 'Total de Bens', 'itens': 'Itens Declarados', 'maior': 'Maior Bem'}
+
+# Colunas dos bens item a item e seus nomes de exibição
+COLUNAS_ITENS_BENS = {
+    'NR_ORDEM_BEM_CANDIDATO': 'Ordem',
+    'DS_TIPO_BEM_CANDIDATO': 'Tipo',
+    'DS_BEM_CANDIDATO': 'Descrição',
+    'VR_BEM_CANDIDATO': 'Valor',
+}
+
+# Colunas exibidas na tabela de candidatos
+# (o nome completo, quando existe, logo depois do nome de urna)
+COLUNAS_TABELA = (
+    ['Nome', 'Nome Completo']
+    + [nome for nome in COLUNAS_TSE.values() if nome != 'Nome']
+    + list(COLUNAS_BENS.values())
+)
+
+# Formatação das colunas de valores na tabela
+FORMATO_TABELA = {'Total de Bens': 'R$ {:,.2f}', 'Maior Bem': 'R$ {:,.2f}'}
+
+
+def arquivos_eleicao(ano=ANO_ELEICAO):
+    # Arquivos nacionais do TSE (candidatos, bens) e pasta da base convertida de um ano
+    return (
+        PADRAO_CANDIDATOS.format(ano=ano, uf='BRASIL'), PADRAO_BENS.format(ano=ano, uf='BRASIL'),
+        f'base_dashboard/candidatos_{ano}',
+    )
+
+
+def arquivos_origem(origem, padrao, ano=ANO_ELEICAO):
+    # Arquivos a ler de uma origem: a própria, se é um arquivo; se é uma pasta (ou o
+    # arquivo nacional não existe), o nacional ou os arquivos por UF da pasta
+    if os.path.isfile(origem):
+        return [origem]
+    pasta = origem if os.path.isdir(origem) else os.path.dirname(origem) or '.'
+    return list(arquivos_tse(pasta, padrao, ano).values())
+
+
+def juntar_bens(df, bens):
+    # Junção vetorizada pela chave do candidato; quem não declarou bens fica com
+    # total e maior bem vazios e zero itens
+    bens = bens.reindex(df[CHAVE_CANDIDATO].to_numpy())
+    for coluna, nome in COLUNAS_BENS.items():
+        df[nome] = bens[coluna].to_numpy()
+    df['Itens Declarados'] = df['Itens Declarados'].fillna(0).astype('int32')
+    return df
+
+
+def tabela_arrow(df):
+    # Categóricas viram dicionários (índices int32 sem nulos, lidos sem cópia);
+    # números mantêm NaN em vez de nulo, para também serem lidos sem cópia
+    colunas = {}
+    for coluna in df.columns:
+        serie = df[coluna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            colunas[coluna] = pa.DictionaryArray.from_arrays(
+                pa.array(serie.cat.codes.to_numpy(dtype=np.int32)),
+                pa.array(serie.cat.categories.astype(str), type=pa.string()),
+            )
+        elif pd.api.types.is_numeric_dtype(serie):
+            colunas[coluna] = pa.array(serie.to_numpy(), from_pandas=False)
+        else:
+            colunas[coluna] = pa.array(serie.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    return pa.table(colunas)
+
+
+def codigos_particao(tabela, campos=CAMPOS_PARTICAO):
+    # Código combinado dos campos de partição de cada linha (ordena como os campos, na
+    # ordem); os lotes da tabela precisam compartilhar os dicionários (unify_dictionaries)
+    chave = np.zeros(tabela.num_rows, dtype=np.int64)
+    for campo in campos:
+        coluna = tabela.column(campo)
+        codigos = np.concatenate([parte.indices.to_numpy(zero_copy_only=False) for parte in coluna.chunks])
+        chave = chave * (len(coluna.chunk(0).dictionary) + 1) + codigos
+    return chave
+
+
+def particoes(tabela, campos=CAMPOS_PARTICAO):
+    # Valores e faixa de linhas [início, fim) de cada partição, ou None se as linhas não
+    # estão agrupadas pelos campos
+    if tabela.num_rows == 0 or any(campo not in tabela.column_names for campo in campos):
+        return None
+    chave = codigos_particao(tabela, campos)
+    inicios = np.flatnonzero(np.diff(chave, prepend=-1))
+    if len(np.unique(chave[inicios])) != len(inicios):
+        return None
+    fins = np.append(inicios[1:], len(chave))
+    valores = [tabela.column(campo).take(pa.array(inicios)).to_pylist() for campo in campos]
+    return {
+        'campos': campos,
+        'valores': [list(linha) for linha in zip(*valores)],
+        'faixas': [[int(inicio), int(fim)] for inicio, fim in zip(inicios, fins)],
+    }
+
+
+def gravar_tabela(tabela, pasta):
+    # Gravação atômica: quem já mapeou a versão anterior continua lendo o arquivo antigo
+    # (um único lote, lido sem cópia), com as partições de cargo e UF nos metadados
+    os.makedirs(pasta, exist_ok=True)
+    tabela = tabela.combine_chunks()
+    metadados = {k: v for k, v in (tabela.schema.metadata or {}).items() if k != b'particoes'}
+    faixas = particoes(tabela)
+    if faixas is not None:
+        metadados[b'particoes'] = json.dumps(faixas).encode()
+    tabela = tabela.replace_schema_metadata(metadados)
+    descritor, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+    os.close(descritor)
+    with pa.OSFile(temporario, 'wb') as arquivo:
+        with pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+            escritor.write_table(tabela, max_chunksize=max(tabela.num_rows, 1))
+    os.replace(temporario, os.path.join(pasta, ARQUIVO_TABELA))
+
+
+def itens_lote(lote, esquema):
+    # Lote de bens lido do CSV (texto) no esquema de bens.arrow; colunas que faltarem no
+    # arquivo do TSE ficam vazias e o valor usa vírgula decimal
+    lote = lote.rename_columns([COLUNAS_ITENS_BENS.get(coluna, coluna) for coluna in lote.column_names])
+    colunas = []
+    for campo in esquema:
+        if campo.name not in lote.column_names:
+            colunas.append(pa.nulls(lote.num_rows, campo.type))
+            continue
+        coluna = lote.column(campo.name)
+        if campo.name == 'Valor':
+            coluna = pc.replace_substring(coluna, ',', '.')
+        colunas.append(coluna.cast(campo.type))
+    return pa.Table.from_arrays(colunas, schema=esquema)
+
+
+def gravar_itens_bens(arquivos_bens, pasta, processos=None):
+    # Bens item a item, lote a lote (ou UF a UF), direto para o arquivo (nunca inteiros
+    # na memória)
+    esquema = pa.schema(
+        [(CHAVE_CANDIDATO, pa.int64())]
+        + [(nome, pa.float64() if nome == 'Valor' else pa.string()) for nome in COLUNAS_ITENS_BENS.values()]
+    )
+    colunas = [CHAVE_CANDIDATO, *COLUNAS_ITENS_BENS]
+    os.makedirs(pasta, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+    os.close(descritor)
+    with pa.OSFile(temporario, 'wb') as arquivo, pa.ipc.new_file(arquivo, esquema) as escritor:
+        for lote in lotes_particoes(arquivos_bens, colunas, processos):
+            escritor.write_table(itens_lote(lote, esquema))
+    os.replace(temporario, os.path.join(pasta, ARQUIVO_ITENS_BENS))
+
+
+def ler_itens_bens(pasta):
+    # Tabela dos bens item a item (mapeada), ou None se a base foi gerada sem bens
+    caminho = os.path.join(pasta, ARQUIVO_ITENS_BENS)
+    if not os.path.exists(caminho):
+        return None
+    return pa.ipc.open_file(pa.memory_map(caminho)).read_all()
+
+
+def totais_itens(itens):
+    # Soma, número de itens e maior item declarado por candidato (mesmo formato de
+    # leitura_tse.totais_bens), agregados pelo Arrow sobre a tabela item a item
+    totais = itens.group_by(CHAVE_CANDIDATO, use_threads=False).aggregate(
+        [('Valor', 'sum'), ('Valor', 'count'), ('Valor', 'max')]
+    ).to_pandas().set_index(CHAVE_CANDIDATO)
+    totais.columns = ['total', 'itens', 'maior']
+    totais['total'] = totais['total'].fillna(0)
+    return totais
+
+
+def preparar_candidatos(origem=ARQUIVO_TSE, totais=None, processos=None, ano=ANO_ELEICAO):
+    # Candidatos dos CSVs do TSE no formato da base: colunas renomeadas, categóricas,
+    # linhas agrupadas por cargo e UF e, com os totais de bens (totais_itens), as colunas
+    # de bens. Lendo apenas as colunas usadas, sem inferência de tipos
+    arquivos = arquivos_origem(origem, PADRAO_CANDIDATOS, ano)
+    if not arquivos:
+        raise FileNotFoundError(f'Arquivos de candidatos do TSE não encontrados em {origem}')
+    with medir('base: leitura do CSV de candidatos'):
+        nomes = {**COLUNAS_TSE, **COLUNAS_TSE_OPCIONAIS}
+        df = ler_particoes(arquivos, [CHAVE_CANDIDATO, *nomes], processos).to_pandas()
+        df[CHAVE_CANDIDATO] = df[CHAVE_CANDIDATO].astype('int64')
+        df = df[[CHAVE_CANDIDATO] + [c for c in nomes if c in df.columns]].rename(columns=nomes)
+
+        for coluna in COLUNAS_CATEGORICAS:
+            df[coluna] = df[coluna].fillna(VALOR_AUSENTE).astype('category')
+        # Ordenação estável: dentro de cada partição as linhas seguem a ordem dos arquivos
+        ordem = np.lexsort([df[campo].cat.codes.to_numpy() for campo in reversed(CAMPOS_PARTICAO)])
+        df = df.iloc[ordem].reset_index(drop=True)
+
+    if totais is not None:
+        df = juntar_bens(df, totais)
+    return df
+
+
+def impressoes(df):
+    # Impressão digital de cada linha: hash de todo o conteúdo menos a chave do candidato
+    # (categóricas entram pelo valor, não pelo código)
+    return pd.util.hash_pandas_object(df.drop(columns=CHAVE_CANDIDATO), index=False).to_numpy()
+
+
+def assinatura_arquivos(caminhos):
+    # Tamanho e data de modificação (ns) de cada arquivo, em sequência
+    estados = [os.stat(caminho) for caminho in caminhos]
+    return np.array([[e.st_size, e.st_mtime_ns] for e in estados], dtype=np.int64).reshape(-1)
+
+
+def gravar_impressoes(chaves, hashes, pasta, arquivos_bens):
+    # Chave e impressão de cada linha gravada, na ordem da tabela, e a assinatura dos
+    # arquivos de bens lidos: o retrato com que a próxima atualização incremental compara
+    # os arquivos novos (atualizar_base.py)
+    descritor, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+    with os.fdopen(descritor, 'wb') as arquivo:
+        np.savez(
+            arquivo, chaves=np.asarray(chaves, dtype=np.int64), hashes=np.asarray(hashes, dtype=np.uint64),
+            bens=assinatura_arquivos(arquivos_bens),
+        )
+    os.replace(temporario, os.path.join(pasta, ARQUIVO_IMPRESSOES))
+
+
+def converter_base(origem=ARQUIVO_TSE, destino=PASTA_BASE, arquivo_bens=ARQUIVO_BENS, processos=None,
+                   ano=ANO_ELEICAO):
+    # origem e arquivo_bens: arquivo nacional ou pasta (ver arquivos_origem); processos:
+    # limite de processos na leitura dos arquivos por UF (padrão: um por núcleo)
+    totais = None
+    arquivos_bens = arquivos_origem(arquivo_bens, PADRAO_BENS, ano)
+    if arquivos_bens:
+        with medir('base: leitura do CSV de bens'):
+            gravar_itens_bens(arquivos_bens, destino, processos)
+            totais = totais_itens(ler_itens_bens(destino))
+    df = preparar_candidatos(origem, totais, processos, ano)
+
+    with medir('base: gravação'):
+        gravar_tabela(tabela_arrow(df), destino)
+        gravar_impressoes(df[CHAVE_CANDIDATO], impressoes(df), destino, arquivos_bens)
+    return BaseCandidatos(destino)
+
+
+def nome_derivado(nome):
+    # 'posto Nome' -> 'posto_nome' (início do nome dos arquivos do derivado)
+    return normalizar_texto(nome).lower().replace(' ', '_')
+
+
+class BaseCandidatos:
+    def __init__(self, pasta=PASTA_BASE):
+        self.pasta = pasta
+        self.arquivo = os.path.join(pasta, ARQUIVO_TABELA)
+        self.tabela = pa.ipc.open_file(pa.memory_map(self.arquivo)).read_all()
+
+    def __len__(self):
+        return self.tabela.num_rows
+
+    @property
+    def columns(self):
+        return self.tabela.column_names
+
+    def _array(self, coluna):
+        return self.tabela.column(coluna).chunk(0)
+
+    def categorias(self, coluna):
+        return self._array(coluna).dictionary.to_pylist()
+
+    def codigos(self, coluna):
+        # Índices do dicionário, sem cópia
+        return self._array(coluna).indices.to_numpy(zero_copy_only=True)
+
+    def valores(self, coluna):
+        # Coluna numérica, sem cópia
+        return self._array(coluna).to_numpy(zero_copy_only=True)
+
+    def colunas_pandas(self, colunas):
+        # DataFrame só com as colunas pedidas (categóricas continuam categóricas);
+        # usado na construção dos agregados, não na renderização
+        dados = {}
+        for coluna in colunas:
+            array = self._array(coluna)
+            if pa.types.is_dictionary(array.type):
+                dados[coluna] = pd.Categorical.from_codes(self.codigos(coluna), self.categorias(coluna))
+            else:
+                dados[coluna] = array.to_pandas()
+        return pd.DataFrame(dados)
+
+    def recorte(self, ids, colunas=None):
+        # Tabela Arrow só com as linhas pedidas, na ordem dos ids
+        tabela = self.tabela if colunas is None else self.tabela.select(colunas)
+        return tabela.take(pa.array(np.asarray(ids, dtype=np.int64)))
+
+    def linhas(self, ids, colunas=None):
+        # Materializa só as linhas pedidas, na ordem dos ids
+        return self.recorte(ids, colunas).to_pandas()
+
+    def particoes(self):
+        # Partições gravadas com a tabela ({'campos', 'valores', 'faixas'}), ou None se a
+        # base foi gerada fora da ordem de cargo e UF
+        faixas = (self.tabela.schema.metadata or {}).get(b'particoes')
+        return json.loads(faixas) if faixas else None
+
+    def itens_bens(self):
+        return ler_itens_bens(self.pasta)
+
+    def derivado(self, nome, construir, versao=1):
+        # Arrays derivados da tabela (índices, postos) gravados ao lado dela em .npy e
+        # abertos por mapeamento de memória. construir() retorna {parte: array}; o retorno
+        # tem as mesmas partes, mapeadas. A versão (do formato, a cargo de quem constrói)
+        # entra no nome dos arquivos e a lista de partes vai em um .json gravado por
+        # último: os arrays são refeitos se a tabela for mais nova, se a versão mudou ou
+        # se falta alguma parte (ex.: gravação interrompida).
+        prefixo = f'{nome_derivado(nome)}.v{versao}'
+        gerada = os.path.getmtime(self.arquivo)
+        manifesto = os.path.join(self.pasta, f'{prefixo}.json')
+        existentes = None
+        if os.path.exists(manifesto) and os.path.getmtime(manifesto) >= gerada:
+            with open(manifesto, encoding='utf-8') as arquivo:
+                partes = json.load(arquivo)
+            existentes = {parte: os.path.join(self.pasta, f'{prefixo}.{parte}.npy') for parte in partes}
+            if not all(os.path.exists(c) and os.path.getmtime(c) >= gerada for c in existentes.values()):
+                existentes = None
+        if existentes is None:
+            existentes = self.gravar_derivado(nome, construir(), versao)
+        return {parte: np.load(caminho, mmap_mode='r') for parte, caminho in existentes.items()}
+
+    def gravar_derivado(self, nome, arrays, versao=1):
+        # Grava as partes de um derivado (substituição atômica) e, por fim, a lista delas;
+        # retorna {parte: caminho}. Os arquivos de outras versões do mesmo derivado são
+        # apagados. Também usado pela atualização incremental, que monta os arrays por diferença
+        nome = nome_derivado(nome)
+        prefixo = f'{nome}.v{versao}'
+        caminhos = {}
+        for parte, array in arrays.items():
+            caminho = os.path.join(self.pasta, f'{prefixo}.{parte}.npy')
+            descritor, temporario = tempfile.mkstemp(dir=self.pasta, suffix='.tmp')
+            with os.fdopen(descritor, 'wb') as arquivo:
+                np.save(arquivo, np.ascontiguousarray(array))
+            os.replace(temporario, caminho)
+            caminhos[parte] = caminho
+        descritor, temporario = tempfile.mkstemp(dir=self.pasta, suffix='.tmp')
+        with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+            json.dump(list(caminhos), arquivo, ensure_ascii=False)
+        os.replace(temporario, os.path.join(self.pasta, f'{prefixo}.json'))
+
+        for arquivo in os.listdir(self.pasta):
+            if (arquivo.startswith(nome + '.') and not arquivo.startswith(prefixo + '.')
+                    and arquivo.endswith(('.npy', '.json'))):
+                os.remove(os.path.join(self.pasta, arquivo))
+        return caminhos
+
+
+def base_desatualizada(origem=ARQUIVO_TSE, destino=PASTA_BASE, arquivo_bens=ARQUIVO_BENS, ano=ANO_ELEICAO):
+    # A base precisa ser (re)gerada se não existe, se algum CSV do TSE é mais novo ou se
+    # falta a tabela de bens item a item (bases geradas por versões anteriores)
+    tabela = os.path.join(destino, ARQUIVO_TABELA)
+    if not os.path.exists(tabela):
+        return True
+    gerada = os.path.getmtime(tabela)
+    arquivos_bens = arquivos_origem(arquivo_bens, PADRAO_BENS, ano)
+    if arquivos_bens and not os.path.exists(os.path.join(destino, ARQUIVO_ITENS_BENS)):
+        return True
+    return any(os.path.getmtime(arquivo) > gerada
+               for arquivo in arquivos_origem(origem, PADRAO_CANDIDATOS, ano) + arquivos_bens)
+
+
+def ler_base(ano=ANO_ELEICAO):
+    origem, arquivo_bens, destino = arquivos_eleicao(ano)
+    if base_desatualizada(origem, destino, arquivo_bens, ano):
+        return converter_base(origem, destino, arquivo_bens, ano=ano)
+    return BaseCandidatos(destino)
+
+
+def anos_disponiveis():
+    # Eleições com base convertida ou com arquivos do TSE para converter
+    anos = []
+    for ano in ANOS_ELEICOES:
+        origem, _, destino = arquivos_eleicao(ano)
+        if os.path.exists(os.path.join(destino, ARQUIVO_TABELA)) or arquivos_origem(origem, PADRAO_CANDIDATOS, ano):
+            anos.append(ano)
+    return anos
+
+
+def ano_selecionado():
+    # Ano escolhido na barra lateral (ponto de entrada), ou a eleição mais recente
+    return st.session_state.get('ano', ANO_ELEICAO)
+
+
+# Aberta uma vez por processo e ano, e compartilhada entre sessões e páginas: só as
+# eleições escolhidas são lidas. A base é somente leitura: as páginas só fazem seleções.
+@st.cache_resource
+def carregar_candidatos(ano=ANO_ELEICAO):
+    return ler_base(ano)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Converte os arquivos do TSE de uma eleição para a base do dashboard')
+    parser.add_argument('origem', nargs='?', help='arquivo de candidatos do TSE (ou pasta por UF)')
+    parser.add_argument('destino', nargs='?', help='pasta da base convertida')
+    parser.add_argument('bens', nargs='?', help='arquivo de bens do TSE (ou pasta por UF)')
+    parser.add_argument('--ano', type=int, default=ANO_ELEICAO)
+    parser.add_argument('--processos', type=int, default=None, help='processos na leitura dos arquivos por UF')
+    args = parser.parse_args()
+
+    origem, arquivo_bens, destino = arquivos_eleicao(args.ano)
+    destino = args.destino or destino
+    base = converter_base(args.origem or origem, destino, args.bens or arquivo_bens, args.processos, args.ano)
+    print(f'{len(base)} candidaturas gravadas em {destino}')
@@ -0,0 +1,188 @@
+# Benchmark de latência das páginas do dashboard
+# Roda as páginas sem navegador (AppTest do Streamlit) sobre uma pasta de dados do TSE,
+# reais ou gerados por dados_sinteticos.py, passando por uma sequência fixa de filtros
+# e reportando p50/p95 de cada etapa. Com --referencia compara o p95 com uma execução
+# anterior e sai com erro se alguma etapa piorou além da tolerância.
+# Uso: python benchmark.py [--dados pasta] [--escala 1] [--repeticoes 5]
+#                          [--saida resultado.json] [--referencia anterior.json]
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from dados_sinteticos import gerar_arquivos
+from leitura_tse import ANO_ELEICAO, PADRAO_CANDIDATOS, arquivos_tse
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+ENTRADA = 'dash_candidatosbr2.py'
+
+# Página, cargo da tabela paginada e arquivo da página
+PAGINAS = {
+    'Prefeitos': ('PREFEITO', 'paginas/prefeitos.py'),
+    'Vice-Prefeitos': ('VICE-PREFEITO', 'paginas/vice_prefeitos.py'),
+    'Vereadores': ('VEREADOR', 'paginas/vereadores.py'),
+}
+
+PERCENTIS = (50, 95)
+TIMEOUT = 600
+
+
+def preparar_pasta(dados, trabalho):
+    # Pasta de execução com o código e base_dashboard do repositório (por links) e os
+    # CSVs de dados; a base convertida é gravada aqui, não no repositório
+    for item in os.listdir(RAIZ):
+        if item in ('.git', 'base_dashboard') or item.endswith('.csv'):
+            continue
+        os.symlink(os.path.join(RAIZ, item), os.path.join(trabalho, item))
+
+    os.makedirs(os.path.join(trabalho, 'base_dashboard'))
+    origem = os.path.join(RAIZ, 'base_dashboard')
+    for item in os.listdir(origem):
+        if os.path.isfile(os.path.join(origem, item)):
+            os.symlink(os.path.join(origem, item), os.path.join(trabalho, 'base_dashboard', item))
+
+    for item in os.listdir(dados):
+        if item.endswith('.csv'):
+            os.symlink(os.path.abspath(os.path.join(dados, item)), os.path.join(trabalho, item))
+
+
+def medir(tempos, etapa, acao):
+    inicio = time.perf_counter()
+    app = acao()
+    tempos.setdefault(etapa, []).append(time.perf_counter() - inicio)
+    if app.exception:
+        raise RuntimeError(f'{etapa}: {app.exception[0].value}')
+    return app
+
+
+def multiselect(app, rotulo):
+    return next(widget for widget in app.multiselect if widget.label == rotulo)
+
+
+def opcoes(app, rotulo):
+    # O AppTest só vê os rótulos formatados ('PT (1.234)'); tira a contagem das facetas
+    return [opcao.rsplit(' (', 1)[0] for opcao in multiselect(app, rotulo).options]
+
+
+def roteiro(app, pagina, tempos):
+    # Sequência fixa de interações, como a de um usuário explorando a página
+    cargo, arquivo = PAGINAS[pagina]
+    etapa = lambda nome: f'{pagina}: {nome}'
+
+    if pagina != 'Prefeitos':
+        app = medir(tempos, etapa('abrir página'), lambda: app.switch_page(arquivo).run())
+
+    estados = opcoes(app, 'Estado')
+    uf = 'SP' if 'SP' in estados else estados[0]
+    app = medir(tempos, etapa('filtrar estado'), lambda: multiselect(app, 'Estado').select(uf).run())
+
+    partidos = opcoes(app, 'Partido')[:2]
+    app = medir(tempos, etapa('filtrar partidos'),
+                lambda: multiselect(app, 'Partido').select(partidos[0]).select(partidos[-1]).run())
+
+    cidade = opcoes(app, 'Cidade')[0]
+    app = medir(tempos, etapa('filtrar cidade'), lambda: multiselect(app, 'Cidade').select(cidade).run())
+
+    app = medir(tempos, etapa('limpar cidade'), lambda: multiselect(app, 'Cidade').unselect(cidade).run())
+
+    app = medir(tempos, etapa('ordenar tabela'),
+                lambda: app.selectbox(key=f'ordem_{cargo}').select('Total de Bens').run())
+    app = medir(tempos, etapa('trocar página da tabela'),
+                lambda: app.number_input(key=f'pagina_{cargo}').set_value(2).run())
+
+    def limpar():
+        multiselect(app, 'Estado').set_value([])
+        return multiselect(app, 'Partido').set_value([]).run()
+    return medir(tempos, etapa('limpar filtros'), limpar)
+
+
+def executar(dados, repeticoes):
+    from streamlit.testing.v1 import AppTest
+
+    from aquecimento import aquecer
+
+    tempos = {}
+    with tempfile.TemporaryDirectory() as trabalho:
+        preparar_pasta(dados, trabalho)
+        diretorio = os.getcwd()
+        os.chdir(trabalho)
+        sys.path.insert(0, trabalho)
+        try:
+            # Conversão da base e montagem dos índices (uma vez por processo)
+            tempos['aquecimento'] = [aquecer()]
+
+            for _ in range(repeticoes):
+                # Sessão nova a cada repetição; os caches de processo continuam quentes
+                app = AppTest.from_file(os.path.join(trabalho, ENTRADA), default_timeout=TIMEOUT)
+                app = medir(tempos, 'Prefeitos: abrir página', app.run)
+                for pagina in PAGINAS:
+                    app = roteiro(app, pagina, tempos)
+        finally:
+            os.chdir(diretorio)
+            sys.path.remove(trabalho)
+    return tempos
+
+
+def resumir(tempos):
+    resumo = {}
+    for etapa, amostras in tempos.items():
+        amostras = np.array(amostras) * 1000
+        resumo[etapa] = {'n': len(amostras), **{f'p{p}': float(np.percentile(amostras, p)) for p in PERCENTIS}}
+    return resumo
+
+
+def imprimir(resumo):
+    largura = max(len(etapa) for etapa in resumo)
+    print(f"{'etapa':<{largura}}  {'n':>3}  {'p50 (ms)':>10}  {'p95 (ms)':>10}")
+    for etapa, valores in resumo.items():
+        print(f"{etapa:<{largura}}  {valores['n']:>3}  {valores['p50']:>10.1f}  {valores['p95']:>10.1f}")
+
+
+def regressoes(resumo, referencia, tolerancia):
+    # Etapas cujo p95 passou do p95 de referência mais a tolerância
+    piores = []
+    for etapa, valores in resumo.items():
+        anterior = referencia.get(etapa)
+        if anterior and valores['p95'] > anterior['p95'] * (1 + tolerancia):
+            piores.append((etapa, anterior['p95'], valores['p95']))
+    return piores
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mede a latência das páginas do dashboard.')
+    parser.add_argument('--dados', help='pasta com os CSVs do TSE; sem ela, gera dados sintéticos')
+    parser.add_argument('--escala', type=float, default=1, help='escala dos dados sintéticos (1, 5, 10...)')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--saida', help='grava o resumo em JSON')
+    parser.add_argument('--referencia', help='JSON de uma execução anterior para comparar')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='piora aceita no p95 (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as sinteticos:
+        dados = args.dados
+        if dados is None:
+            dados = sinteticos
+            n_candidatos, _ = gerar_arquivos(dados, args.escala, args.semente)
+            print(f'Dados sintéticos: {n_candidatos} candidaturas (escala {args.escala:g})')
+        elif not arquivos_tse(dados, PADRAO_CANDIDATOS):
+            # Aceita o arquivo nacional ou os arquivos por UF
+            sys.exit(f'{dados} não tem {PADRAO_CANDIDATOS.format(ano=ANO_ELEICAO, uf="BRASIL")} nem os arquivos por UF')
+        resumo = resumir(executar(dados, args.repeticoes))
+
+    imprimir(resumo)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resumo, arquivo, ensure_ascii=False, indent=2)
+
+    if args.referencia:
+        with open(args.referencia, encoding='utf-8') as arquivo:
+            piores = regressoes(resumo, json.load(arquivo), args.tolerancia)
+        for etapa, antes, agora in piores:
+            print(f'REGRESSÃO {etapa}: p95 {antes:.1f} ms -> {agora:.1f} ms')
+        sys.exit(1 if piores else 0)
@@ -0,0 +1,223 @@
+# Busca de candidatos pelo nome
+# Índice montado uma vez sobre o nome de urna e o nome completo, sem acentos
+# (JOÃO = JOAO), e gravado ao lado da base de candidatos (mapeado em memória):
+#   - vocabulário ordenado das palavras dos nomes, com a lista de linhas de cada palavra:
+#     uma palavra da busca casa com todas as palavras que começam com ela (prefixo);
+#   - trigramas de cada palavra do vocabulário: palavras parecidas com a da busca
+#     (erros de digitação) também casam, com peso menor.
+# Todas as palavras da busca precisam casar (E); cada linha recebe a soma das notas das
+# palavras e as k melhores são retornadas. A busca pode ser restrita aos ids de um
+# filtro, então se combina com Estado/Cidade/Partido/Gênero.
+
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from base_candidatos import carregar_candidatos
+from leitura_tse import ANO_ELEICAO, normalizar_texto
+from metricas import medir
+from tabela_paginada import carregar_tabela
+
+# Colunas indexadas e o peso de uma palavra encontrada em cada uma
+COLUNAS_BUSCA = {'Nome': 1.0, 'Nome Completo': 0.9}
+
+# Notas de uma palavra do nome para uma palavra da busca
+NOTA_EXATA = 1.0
+NOTA_PREFIXO = 0.9
+NOTA_TRIGRAMAS = 0.8
+
+# Semelhança mínima (Jaccard dos trigramas) para uma palavra parecida contar
+LIMIAR_TRIGRAMAS = 0.3
+
+TOP_K = 20
+
+# Versão do formato dos arrays da busca gravados com a base (sobe quando ele muda)
+VERSAO_BUSCA = 1
+
+
+def normalizar_busca(texto):
+    # Mesma normalização do índice: maiúsculas, sem acentos e só letras, números e espaços
+    return re.sub(r'[^A-Z0-9 ]', ' ', normalizar_texto(texto)).split()
+
+
+def normalizar_serie(serie):
+    return (
+        serie.fillna('').astype(str).str.normalize('NFKD')
+        .str.encode('ascii', 'ignore').str.decode('ascii').str.upper()
+        .str.replace(r'[^A-Z0-9 ]', ' ', regex=True)
+    )
+
+
+def trigramas(palavras):
+    # Códigos (int32) dos trigramas de cada palavra, com as bordas marcadas por espaços
+    # ('  J', ' JO', 'JOA', 'OAO', 'AO '). Retorna (posição da palavra, código) sem repetição.
+    if len(palavras) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+    textos = np.char.add(np.char.add(b'  ', np.asarray(palavras, dtype=bytes)), b' ')
+    largura = textos.dtype.itemsize
+    letras = np.frombuffer(textos.tobytes(), dtype=np.uint8).reshape(len(textos), largura).astype(np.int32)
+    codigos = (letras[:, :-2] << 16) | (letras[:, 1:-1] << 8) | letras[:, 2:]
+    validos = letras[:, 2:] != 0
+    posicoes = np.broadcast_to(np.arange(len(textos))[:, None], codigos.shape)[validos]
+    pares = np.unique(posicoes.astype(np.int64) << 32 | codigos[validos].astype(np.int64))
+    return pares >> 32, (pares & 0xFFFFFFFF).astype(np.int32)
+
+
+def csr(chaves, valores, n_chaves):
+    # Valores agrupados por chave (0..n_chaves-1), com o início de cada grupo
+    ordem = np.argsort(chaves, kind='stable')
+    inicios = np.concatenate([[0], np.cumsum(np.bincount(chaves, minlength=n_chaves))])
+    return valores[ordem], inicios
+
+
+def arrays_busca(base):
+    # Pares (linha, palavra) das colunas de nome, com o maior peso quando a palavra
+    # aparece nas duas
+    pares = []
+    for coluna, peso in COLUNAS_BUSCA.items():
+        if coluna not in base.columns:
+            continue
+        palavras = normalizar_serie(base.colunas_pandas([coluna])[coluna]).str.split().explode().dropna()
+        pares.append(pd.DataFrame({'linha': palavras.index.to_numpy(np.int64), 'palavra': palavras.to_numpy(), 'peso': peso}))
+    pares = pd.concat(pares, ignore_index=True)
+    pares = pares[pares['palavra'] != ''].sort_values('peso', ascending=False).drop_duplicates(['linha', 'palavra'])
+    pares = pares.sort_values('linha', kind='stable')
+
+    codigos, vocabulario = pd.factorize(pares['palavra'], sort=True)
+    vocabulario = np.asarray(vocabulario, dtype=bytes)
+    linhas, inicios = csr(codigos, pares['linha'].to_numpy(), len(vocabulario))
+    pesos, _ = csr(codigos, pares['peso'].to_numpy(np.float32), len(vocabulario))
+
+    posicoes, codigos_tri = trigramas(vocabulario)
+    tri_codigos, tri_posicoes = np.unique(codigos_tri, return_inverse=True)
+    tri_palavras, tri_inicios = csr(tri_posicoes, posicoes.astype(np.int32), len(tri_codigos))
+    return {
+        'vocabulario': vocabulario,
+        'inicios': inicios,
+        'linhas': linhas,
+        'pesos': pesos,
+        'tri_codigos': tri_codigos,
+        'tri_inicios': tri_inicios,
+        'tri_palavras': tri_palavras,
+        'tri_tamanhos': np.bincount(posicoes, minlength=len(vocabulario)).astype(np.int32),
+    }
+
+
+def maximo_por_linha(linhas, notas):
+    # Uma nota por linha: a maior entre as palavras do nome que casaram
+    ordem = np.argsort(linhas, kind='stable')
+    linhas, notas = linhas[ordem], notas[ordem]
+    unicas, inicios = np.unique(linhas, return_index=True)
+    return unicas, np.maximum.reduceat(notas, inicios) if len(linhas) else notas
+
+
+class BuscaNomes:
+    def __init__(self, base):
+        arrays = base.derivado('busca nomes', lambda: arrays_busca(base), VERSAO_BUSCA)
+        self.vocabulario = arrays['vocabulario']
+        self.inicios = arrays['inicios']
+        self.linhas = arrays['linhas']
+        self.pesos = arrays['pesos']
+        self.tri_codigos = arrays['tri_codigos']
+        self.tri_inicios = arrays['tri_inicios']
+        self.tri_palavras = arrays['tri_palavras']
+        self.tri_tamanhos = arrays['tri_tamanhos']
+
+    def palavras_parecidas(self, palavra):
+        # Palavras do vocabulário com Jaccard dos trigramas acima do limiar, e a semelhança
+        _, codigos = trigramas([palavra])
+        posicoes = np.searchsorted(self.tri_codigos, codigos)
+        achados = posicoes < len(self.tri_codigos)
+        achados[achados] = self.tri_codigos[posicoes[achados]] == codigos[achados]
+        posicoes = posicoes[achados]
+        if len(posicoes) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        partes = [self.tri_palavras[self.tri_inicios[p]:self.tri_inicios[p + 1]] for p in posicoes]
+        palavras, comuns = np.unique(np.concatenate(partes), return_counts=True)
+        semelhanca = comuns / (len(codigos) + self.tri_tamanhos[palavras] - comuns)
+        escolhidas = semelhanca >= LIMIAR_TRIGRAMAS
+        return palavras[escolhidas].astype(np.int64), semelhanca[escolhidas]
+
+    def notas_palavra(self, palavra):
+        # Palavras do vocabulário que casam com a palavra da busca e suas notas
+        # O intervalo [palavra, palavra com a última letra seguinte) do vocabulário ordenado
+        # tem exatamente as palavras com esse prefixo
+        chave = palavra.encode('ascii')
+        if len(chave) > self.vocabulario.dtype.itemsize:
+            prefixo = np.empty(0, dtype=np.int64)
+        else:
+            seguinte = chave[:-1] + bytes([chave[-1] + 1])
+            inicio, fim = np.searchsorted(self.vocabulario, [chave, seguinte], side='left')
+            prefixo = np.arange(inicio, fim)
+        notas = np.where(self.vocabulario[prefixo] == chave, NOTA_EXATA, NOTA_PREFIXO)
+        if len(palavra) >= 3:
+            parecidas, semelhanca = self.palavras_parecidas(palavra)
+            prefixo = np.concatenate([prefixo, parecidas])
+            notas = np.concatenate([notas, semelhanca * NOTA_TRIGRAMAS])
+        return prefixo, notas
+
+    def linhas_palavra(self, palavra):
+        palavras, notas = self.notas_palavra(palavra)
+        if len(palavras) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        tamanhos = self.inicios[palavras + 1] - self.inicios[palavras]
+        linhas = np.concatenate([self.linhas[self.inicios[p]:self.inicios[p + 1]] for p in palavras])
+        pesos = np.concatenate([self.pesos[self.inicios[p]:self.inicios[p + 1]] for p in palavras])
+        return maximo_por_linha(linhas, np.repeat(notas, tamanhos) * pesos)
+
+    def buscar(self, consulta, ids=None, k=TOP_K):
+        # Retorna (linhas, notas) das k melhores, da maior nota para a menor;
+        # ids (ordenados) restringe a busca ao resultado de um filtro
+        palavras = normalizar_busca(consulta)
+        if not palavras:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        with medir('busca por nome'):
+            linhas, notas = None, None
+            for palavra in palavras:
+                linhas_p, notas_p = self.linhas_palavra(palavra)
+                if linhas is None:
+                    linhas, notas = linhas_p, notas_p
+                else:
+                    linhas, a, b = np.intersect1d(linhas, linhas_p, assume_unique=True, return_indices=True)
+                    notas = notas[a] + notas_p[b]
+                if len(linhas) == 0:
+                    break
+
+            if ids is not None and len(linhas):
+                posicoes = np.minimum(np.searchsorted(ids, linhas), len(ids) - 1)
+                dentro = ids[posicoes] == linhas if len(ids) else np.zeros(len(linhas), dtype=bool)
+                linhas, notas = linhas[dentro], notas[dentro]
+
+            if 0 < k < len(linhas):
+                # Só as k melhores são ordenadas: argpartition acha a k-ésima nota e, entre
+                # os empatados nela, ficam as primeiras linhas (linhas vem em ordem crescente)
+                limiar = notas[np.argpartition(-notas, k - 1)[k - 1]]
+                acima = np.flatnonzero(notas > limiar)
+                empatadas = np.flatnonzero(notas == limiar)[:k - len(acima)]
+                escolhidas = np.concatenate([acima, empatadas])
+                linhas, notas = linhas[escolhidas], notas[escolhidas]
+
+            # Empates ficam na ordem da base
+            ordem = np.lexsort((linhas, -notas))[:k]
+            return linhas[ordem], notas[ordem]
+
+
+@st.cache_resource
+def carregar_busca(ano=ANO_ELEICAO):
+    return BuscaNomes(carregar_candidatos(ano))
+
+
+def exibir_busca(cargo, ids, ano=ANO_ELEICAO):
+    # Caixa de busca sobre o resultado dos filtros da página; mostra as k melhores
+    consulta = st.text_input('Buscar candidato pelo nome', key=f'busca_{cargo}', placeholder='ex.: joao silva')
+    if not consulta.strip():
+        return
+    linhas, _ = carregar_busca(ano).buscar(consulta, ids)
+    if len(linhas) == 0:
+        st.caption('Nenhum candidato encontrado com esse nome nos filtros atuais.')
+        return
+    st.dataframe(carregar_tabela(ano).pagina(linhas, 1, len(linhas)), hide_index=True)
+    st.caption(f'{len(linhas)} melhores resultados para "{consulta.strip()}".')
@@ -0,0 +1,33 @@
+# Cache de figuras dos gráficos estáticos
+# Os gráficos que dependem só dos CSVs de base_dashboard são construídos uma vez por
+# processo e compartilhados entre sessões. A chave inclui data de modificação e tamanho
+# dos arquivos de origem: se um CSV muda, a figura é reconstruída na próxima execução.
+
+import os
+
+import streamlit as st
+
+from metricas import medir
+
+# Entradas antigas (arquivos já substituídos) saem do cache por este limite
+MAX_FIGURAS = 64
+
+
+def assinatura_arquivos(caminhos):
+    assinatura = []
+    for caminho in caminhos:
+        info = os.stat(caminho)
+        assinatura.append((caminho, info.st_mtime_ns, info.st_size))
+    return tuple(assinatura)
+
+
+# As figuras retornadas são compartilhadas: quem usa não deve alterá-las
+@st.cache_resource(max_entries=MAX_FIGURAS, show_spinner=False)
+def _figuras(nome, assinatura, _construir):
+    with medir('gráficos estáticos: construção'):
+        return _construir()
+
+
+def figuras_em_cache(nome, construir, *caminhos):
+    # construir() lê os arquivos e retorna a figura (ou tupla de figuras) pronta
+    return _figuras(nome, assinatura_arquivos(caminhos), construir)
@@ -0,0 +1,134 @@
+# Cache de resultados de filtros compartilhado entre sessões
+# Combinações populares de filtros (ex.: RJ + RIO DE JANEIRO) são calculadas uma vez:
+# os ids das linhas e as contagens por cor, partido e gênero ficam num LRU limitado em
+# bytes (DASH_CACHE_RESULTADOS_MB) e são servidos a todas as sessões do processo.
+# A chave é o ano e a combinação normalizada (campos e valores ordenados, campos vazios
+# fora), então a ordem em que o usuário escolheu os valores não importa.
+# Numa falta, se a sessão guardou o resultado anterior e só um multiselect mudou, o novo
+# resultado sai dele por diferença (refino_filtros.py) em vez do cálculo completo.
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from cubo_contagens import carregar_cubo
+from indice_filtros import carregar_indice
+from leitura_tse import ANO_ELEICAO
+from metricas import medir, registrar_estatisticas
+from refino_filtros import refinar
+
+LIMITE_BYTES = int(float(os.environ.get('DASH_CACHE_RESULTADOS_MB', '256')) * 2**20)
+
+# Dimensões com contagens guardadas junto de cada resultado
+DIMENSOES_CONTAGEM = ['Cor', 'Partido', 'Gênero']
+
+
+def chave_filtros(filtros):
+    return tuple((campo, tuple(sorted(valores))) for campo, valores in sorted(filtros.items()) if valores)
+
+
+def tamanho_bytes(valor):
+    # Estimativa da memória ocupada por uma entrada (arrays, séries e dicionários delas)
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(deep=True, index=True))
+    if isinstance(valor, dict):
+        return sum(tamanho_bytes(v) for v in valor.values())
+    return sys.getsizeof(valor)
+
+
+class CacheLRU:
+    # LRU com orçamento em bytes: ao passar do limite, saem as entradas usadas há mais
+    # tempo até o total caber; entradas maiores que o limite inteiro nem entram
+    def __init__(self, limite_bytes=LIMITE_BYTES):
+        self.limite_bytes = limite_bytes
+        self.bytes = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.despejos = 0
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, chave):
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is None:
+                self.faltas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return item[0]
+
+    def guardar(self, chave, valor):
+        tamanho = tamanho_bytes(valor)
+        if tamanho > self.limite_bytes:
+            return
+        with self._trava:
+            anterior = self._itens.pop(chave, None)
+            if anterior is not None:
+                self.bytes -= anterior[1]
+            self._itens[chave] = (valor, tamanho)
+            self.bytes += tamanho
+            while self.bytes > self.limite_bytes:
+                _, (_, removido) = self._itens.popitem(last=False)
+                self.bytes -= removido
+                self.despejos += 1
+
+    def estatisticas(self):
+        with self._trava:
+            consultas = self.acertos + self.faltas
+            return {
+                'entradas': len(self._itens),
+                'bytes': self.bytes,
+                'limite_bytes': self.limite_bytes,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'despejos': self.despejos,
+                'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            }
+
+
+@st.cache_resource
+def carregar_cache_resultados():
+    cache = CacheLRU()
+    registrar_estatisticas('cache_resultados', cache.estatisticas)
+    return cache
+
+
+def calcular_resultado(filtros, ano=ANO_ELEICAO):
+    cubo = carregar_cubo(ano)
+    return {
+        'ids': carregar_indice(ano).filtrar(filtros),
+        'total': cubo.total(filtros),
+        'contagens': {dimensao: cubo.contar(dimensao, filtros) for dimensao in DIMENSOES_CONTAGEM},
+    }
+
+
+def resultado_filtros(filtros, chave_sessao=None, ano=ANO_ELEICAO):
+    # filtros no formato do cubo (inclui 'Cargo'). Retorna {'ids', 'total', 'contagens'};
+    # o resultado é compartilhado e não deve ser alterado por quem usa.
+    # Com chave_sessao, o resultado fica em st.session_state para o refino da próxima execução
+    cache = carregar_cache_resultados()
+    chave = chave_filtros(filtros)
+    resultado = cache.obter((ano, chave))
+    if resultado is None:
+        anterior = st.session_state.get(chave_sessao) if chave_sessao else None
+        with medir('resultado dos filtros'):
+            # O resultado anterior só serve de partida se é do mesmo ano
+            if anterior is not None and anterior.get('ano') == ano:
+                resultado = refinar(anterior['filtros'], dict(chave), anterior['resultado'], ano)
+            if resultado is None:
+                resultado = calcular_resultado(filtros, ano)
+        if resultado['ids'] is not None:
+            # Compartilhado entre sessões: somente leitura
+            resultado['ids'].flags.writeable = False
+        cache.guardar((ano, chave), resultado)
+    if chave_sessao:
+        st.session_state[chave_sessao] = {'ano': ano, 'filtros': dict(chave), 'resultado': resultado}
+    return resultado
@@ -0,0 +1,61 @@
+# Comparação entre eleições (2016, 2020, 2024)
+# As séries de cada ano saem do cubo de contagens daquele ano, com os mesmos filtros da
+# página (a mesma API de contagens dos gráficos e do mapa): só os cubos são consultados,
+# as linhas das bases de outros anos não são lidas a cada execução.
+# Com estado(s) selecionado(s) a proporção de candidaturas femininas vem por UF; sem
+# estado, para o Brasil todo.
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from base_candidatos import anos_disponiveis
+from cubo_contagens import carregar_cubo
+from mapas import proporcao_feminina
+from metricas import medir
+
+
+def proporcao_feminina_anos(filtros, anos):
+    # Candidaturas, femininas e % feminino por ano e UF (ou 'BRASIL')
+    partes = []
+    for ano in anos:
+        dados = proporcao_feminina(carregar_cubo(ano), 'UF', filtros)
+        estados = filtros.get('UF') or []
+        if estados:
+            dados = dados[dados['UF'].isin(estados)]
+        else:
+            dados = dados[['Candidaturas', 'Femininas']].sum().to_frame().T.assign(UF='BRASIL')
+        partes.append(dados.assign(Ano=str(ano)))
+    df = pd.concat(partes, ignore_index=True)
+    df['% Feminino'] = df['Femininas'] / df['Candidaturas']
+    return df
+
+
+def totais_anos(filtros, anos):
+    return pd.DataFrame({'Ano': [str(ano) for ano in anos], 'Candidaturas': [carregar_cubo(ano).total(filtros) for ano in anos]})
+
+
+def exibir_comparacao_anos(filtros):
+    # filtros no formato do cubo (inclui 'Cargo'); só aparece com mais de uma eleição
+    anos = anos_disponiveis()
+    if len(anos) < 2:
+        return
+    st.markdown("##### Comparação entre Eleições:")
+    with medir('comparação entre anos'):
+        femininas = proporcao_feminina_anos(filtros, anos)
+        totais = totais_anos(filtros, anos)
+        fig_femininas = px.line(
+            femininas, x='Ano', y='% Feminino', color='UF', markers=True,
+            hover_data={'Candidaturas': True, 'Femininas': True},
+        )
+        fig_femininas.update_layout(yaxis_tickformat='.0%', height=400, title='% de Candidaturas Femininas por Eleição')
+        fig_totais = px.bar(totais, x='Ano', y='Candidaturas', text='Candidaturas')
+        fig_totais.update_layout(height=400, title='Total de Candidaturas por Eleição')
+
+    col1, col2 = st.columns(2)
+    with col1:
+        with medir('gráficos: envio'):
+            st.plotly_chart(fig_femininas, use_container_width=True)
+    with col2:
+        with medir('gráficos: envio'):
+            st.plotly_chart(fig_totais, use_container_width=True)
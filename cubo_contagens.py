@@ -0,0 +1,59 @@
+# Cubo de contagens pré-agregado
+# Guarda só as células não vazias de (cargo, UF, cidade, partido, gênero, cor) com o
+# número de candidaturas de cada uma. As contagens dos gráficos filtrados saem da soma
+# dessas células, sem tocar nas linhas da base de candidatos.
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from base_candidatos import carregar_candidatos
+from indice_filtros import IndiceFiltros
+from leitura_tse import ANO_ELEICAO
+from metricas import medir
+
+DIMENSOES_CUBO = ['Cargo', 'UF', 'Cidade', 'Partido', 'Gênero', 'Cor']
+
+
+def serie_contagens(soma, categorias, dimensao):
+    # Contagens por categoria no formato de value_counts(): sem zeros, maiores primeiro
+    serie = pd.Series(np.asarray(soma, dtype=np.int64), index=pd.Index(categorias, name=dimensao), name='count')
+    return serie[serie > 0].sort_values(ascending=False, kind='stable')
+
+
+class CuboContagens:
+    def __init__(self, df, dimensoes=DIMENSOES_CUBO):
+        celulas = df.groupby(dimensoes, observed=True, dropna=False).size()
+        celulas = celulas[celulas > 0].reset_index(name='Candidaturas')
+
+        self.dimensoes = dimensoes
+        self.contagens = celulas['Candidaturas'].to_numpy(dtype=np.int64)
+
+        # As células são indexadas como as linhas da base: o mesmo filtro serve às duas
+        self.indice = IndiceFiltros(celulas, campos=dimensoes)
+
+    def total(self, filtros):
+        with medir('contagens (cubo)'):
+            ids = self.indice.filtrar(filtros)
+            contagens = self.contagens if ids is None else self.contagens[ids]
+            return int(contagens.sum())
+
+    def contar(self, dimensao, filtros):
+        # Contagem por valor da dimensão sob os filtros, no formato de value_counts()
+        with medir('contagens (cubo)'):
+            ids = self.indice.filtrar(filtros)
+            codigos = self.indice.codigos[dimensao]
+            contagens = self.contagens
+            if ids is not None:
+                codigos = codigos[ids]
+                contagens = contagens[ids]
+
+            categorias = self.indice.categorias[dimensao]
+            soma = np.bincount(codigos, weights=contagens, minlength=len(categorias) + 1)[1:]
+            return serie_contagens(soma, categorias, dimensao)
+
+
+# Um cubo por eleição: é o que as comparações entre anos consultam
+@st.cache_resource
+def carregar_cubo(ano=ANO_ELEICAO):
+    return CuboContagens(carregar_candidatos(ano).colunas_pandas(DIMENSOES_CUBO))
@@ -0,0 +1,186 @@
+# Gerador de dados sintéticos no formato do TSE
+# Produz consulta_cand e bem_candidato com as cardinalidades reais de 2024 (5.569
+# municípios em 26 UFs mais o DF, sem eleição municipal; 29 partidos; ~15 mil
+# candidaturas a prefeito e ~430 mil a vereador na escala 1), para medir o dashboard
+# sem os arquivos reais. A mesma semente gera sempre os mesmos arquivos.
+# Uso: python dados_sinteticos.py --destino pasta [--escala 1] [--semente 0] [--por-uf]
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from leitura_tse import ANO_ELEICAO, CHAVE_CANDIDATO, PADRAO_BENS, PADRAO_CANDIDATOS
+
+# Número de municípios com eleição em 2024 por UF
+MUNICIPIOS_UF = {
+    'AC': 22, 'AL': 102, 'AM': 62, 'AP': 16, 'BA': 417, 'CE': 184, 'DF': 0, 'ES': 78,
+    'GO': 246, 'MA': 217, 'MG': 853, 'MS': 79, 'MT': 142, 'PA': 144, 'PB': 223, 'PE': 184,
+    'PI': 224, 'PR': 399, 'RJ': 92, 'RN': 167, 'RO': 52, 'RR': 15, 'RS': 497, 'SC': 295,
+    'SE': 75, 'SP': 645, 'TO': 139,
+}
+
+# Partidos, do maior para o menor número de candidaturas
+PARTIDOS = [
+    'PL', 'PSD', 'MDB', 'UNIÃO', 'PP', 'REPUBLICANOS', 'PT', 'PSB', 'PDT', 'PODE',
+    'PSDB', 'AVANTE', 'SOLIDARIEDADE', 'PRD', 'CIDADANIA', 'AGIR', 'PV', 'MOBILIZA', 'DC',
+    'PC do B', 'PSOL', 'NOVO', 'REDE', 'PMB', 'PRTB', 'UP', 'PCB', 'PSTU', 'PCO',
+]
+
+# Candidaturas por município na escala 1 (médias; municípios maiores têm mais)
+PREFEITOS_MUNICIPIO = 15_400 / 5_569
+VEREADORES_MUNICIPIO = 430_000 / 5_569
+
+# Distribuições aproximadas das categorias
+COR_RACA = {
+    'BRANCA': 0.48, 'PARDA': 0.39, 'PRETA': 0.11, 'INDÍGENA': 0.005, 'AMARELA': 0.004,
+    'NÃO INFORMADO': 0.011,
+}
+GENERO = {
+    'PREFEITO': {'MASCULINO': 0.84, 'FEMININO': 0.16},
+    'VICE-PREFEITO': {'MASCULINO': 0.78, 'FEMININO': 0.22},
+    'VEREADOR': {'MASCULINO': 0.65, 'FEMININO': 0.35},
+}
+GRAU_INSTRUCAO = {
+    'SUPERIOR COMPLETO': 0.36, 'ENSINO MÉDIO COMPLETO': 0.38, 'SUPERIOR INCOMPLETO': 0.07,
+    'ENSINO FUNDAMENTAL COMPLETO': 0.08, 'ENSINO FUNDAMENTAL INCOMPLETO': 0.07,
+    'ENSINO MÉDIO INCOMPLETO': 0.03, 'LÊ E ESCREVE': 0.01,
+}
+OCUPACOES = [
+    'OUTROS', 'EMPRESÁRIO', 'COMERCIANTE', 'AGRICULTOR', 'SERVIDOR PÚBLICO MUNICIPAL',
+    'PROFESSOR DE ENSINO FUNDAMENTAL', 'VEREADOR', 'APOSENTADO (EXCETO SERVIDOR PÚBLICO)',
+    'DONA DE CASA', 'ADVOGADO', 'ESTUDANTE', 'MOTORISTA PARTICULAR', 'ENFERMEIRO', 'MÉDICO',
+    'POLICIAL MILITAR', 'PREFEITO', 'AGENTE DE SAÚDE E SANITARISTA', 'PEDREIRO', 'ENGENHEIRO',
+]
+TIPOS_BEM = {
+    'CASA': 0.25, 'TERRENO': 0.18, 'VEÍCULO AUTOMOTOR TERRESTRE: CAMINHÃO, AUTOMÓVEL, MOTO, ETC.': 0.22,
+    'DEPÓSITO BANCÁRIO EM CONTA CORRENTE NO PAÍS': 0.15, 'APARTAMENTO': 0.06,
+    'QUOTAS OU QUINHÕES DE CAPITAL': 0.05, 'IMÓVEL RURAL': 0.05, 'OUTROS BENS E DIREITOS': 0.04,
+}
+
+PRENOMES = [
+    'JOSÉ', 'MARIA', 'ANTÔNIO', 'JOÃO', 'FRANCISCO', 'ANA', 'LUIZ', 'PAULO', 'CARLOS',
+    'MÁRCIA', 'PEDRO', 'LUCAS', 'FÁBIO', 'SÉRGIO', 'ADRIANA', 'JULIANA', 'CLÁUDIO',
+    'RAIMUNDO', 'SEBASTIÃO', 'CONCEIÇÃO', 'ANDRÉ', 'MÔNICA', 'VÂNIA', 'JOSIANE',
+]
+SOBRENOMES = [
+    'SILVA', 'SANTOS', 'OLIVEIRA', 'SOUZA', 'RODRIGUES', 'FERREIRA', 'ALVES', 'PEREIRA',
+    'LIMA', 'GOMES', 'RIBEIRO', 'CARVALHO', 'ARAÚJO', 'MELO', 'BARBOSA', 'CONCEIÇÃO',
+    'GONÇALVES', 'ROMÃO', 'BRANDÃO', 'FALCÃO', 'NASCIMENTO', 'MOURA', 'CAVALCANTI',
+]
+APELIDOS = ['', '', '', 'ZÉ ', 'DR. ', 'PROFESSOR ', 'PROFESSORA ', 'IRMÃO ', 'PASTOR ', 'TIA ']
+
+# Primeiro SQ_CANDIDATO gerado (mesma ordem de grandeza dos sequenciais de 2024)
+SQ_INICIAL = 250_000_000_000
+
+
+def sortear(rng, distribuicao, n):
+    opcoes = list(distribuicao)
+    pesos = np.array(list(distribuicao.values()))
+    return np.asarray(opcoes, dtype=object)[rng.choice(len(opcoes), n, p=pesos / pesos.sum())]
+
+
+def pesos_zipf(n, expoente):
+    pesos = 1 / np.arange(1, n + 1) ** expoente
+    return pesos / pesos.sum()
+
+
+def gerar_municipios(rng):
+    # Um porte por município (lognormal): define quantas candidaturas ele recebe
+    ufs = np.repeat(list(MUNICIPIOS_UF), list(MUNICIPIOS_UF.values()))
+    numeros = np.concatenate([np.arange(1, n + 1) for n in MUNICIPIOS_UF.values()])
+    nomes = [f'MUNICÍPIO {numero} DE {uf}' for uf, numero in zip(ufs, numeros)]
+    porte = rng.lognormal(0, 0.8, len(ufs))
+    return pd.DataFrame({'SG_UF': ufs, 'NM_UE': nomes, 'porte': porte / porte.mean()})
+
+
+def gerar_nomes(rng, n):
+    prenome = np.asarray(PRENOMES, dtype=object)[rng.integers(0, len(PRENOMES), n)]
+    meio = np.asarray(SOBRENOMES, dtype=object)[rng.integers(0, len(SOBRENOMES), n)]
+    fim = np.asarray(SOBRENOMES, dtype=object)[rng.integers(0, len(SOBRENOMES), n)]
+    apelido = np.asarray(APELIDOS, dtype=object)[rng.integers(0, len(APELIDOS), n)]
+    completo = pd.Series(prenome) + ' ' + meio + ' ' + fim
+    urna = pd.Series(apelido) + prenome + ' ' + np.where(rng.random(n) < 0.5, meio, fim)
+    return completo, urna
+
+
+def gerar_candidatos(escala=1, semente=0):
+    rng = np.random.default_rng(semente)
+    municipios = gerar_municipios(rng)
+
+    # Prefeitos: ao menos um por município; vices acompanham os prefeitos
+    prefeitos = 1 + rng.poisson(np.maximum(PREFEITOS_MUNICIPIO * escala * municipios['porte'] ** 0.3 - 1, 0))
+    vereadores = rng.poisson(VEREADORES_MUNICIPIO * escala * municipios['porte'])
+    cargos = {'PREFEITO': prefeitos, 'VICE-PREFEITO': prefeitos, 'VEREADOR': vereadores}
+
+    partes = []
+    for cargo, quantidades in cargos.items():
+        linhas = np.repeat(np.arange(len(municipios)), quantidades)
+        parte = municipios.iloc[linhas][['SG_UF', 'NM_UE']].reset_index(drop=True)
+        parte['DS_CARGO'] = cargo
+        parte['DS_GENERO'] = sortear(rng, GENERO[cargo], len(parte))
+        partes.append(parte)
+    df = pd.concat(partes, ignore_index=True)
+    n = len(df)
+
+    df.insert(0, 'ANO_ELEICAO', ANO_ELEICAO)
+    df[CHAVE_CANDIDATO] = SQ_INICIAL + np.arange(n)
+    df['NM_CANDIDATO'], df['NM_URNA_CANDIDATO'] = gerar_nomes(rng, n)
+    df['SG_PARTIDO'] = np.asarray(PARTIDOS, dtype=object)[rng.choice(len(PARTIDOS), n, p=pesos_zipf(len(PARTIDOS), 0.8))]
+    df['DS_GRAU_INSTRUCAO'] = sortear(rng, GRAU_INSTRUCAO, n)
+    df['DS_COR_RACA'] = sortear(rng, COR_RACA, n)
+    df['DS_OCUPACAO'] = np.asarray(OCUPACOES, dtype=object)[rng.choice(len(OCUPACOES), n, p=pesos_zipf(len(OCUPACOES), 1.1))]
+    df['DS_SITUACAO_CANDIDATURA'] = 'APTO'
+    return df
+
+
+def gerar_bens(candidatos, semente=0):
+    # Cerca de 2/3 declaram bens; o número de itens é geométrico e os valores têm
+    # cauda pesada (lognormal com alguns patrimônios muito acima da mediana)
+    rng = np.random.default_rng(semente + 1)
+    declarantes = candidatos[rng.random(len(candidatos)) < 0.65]
+    itens = rng.geometric(0.35, len(declarantes))
+    linhas = np.repeat(np.arange(len(declarantes)), itens)
+
+    bens = declarantes.iloc[linhas][['ANO_ELEICAO', 'SG_UF', 'NM_UE', CHAVE_CANDIDATO]].reset_index(drop=True)
+    inicio_item = np.repeat(np.cumsum(itens) - itens, itens)
+    bens['NR_ORDEM_BEM_CANDIDATO'] = np.arange(len(bens)) - inicio_item + 1
+    bens['DS_TIPO_BEM_CANDIDATO'] = sortear(rng, TIPOS_BEM, len(bens))
+    bens['DS_BEM_CANDIDATO'] = bens['DS_TIPO_BEM_CANDIDATO']
+    valores = rng.lognormal(10.5, 1.6, len(bens))
+    cauda = rng.random(len(bens)) < 0.002
+    valores[cauda] *= rng.pareto(1.2, cauda.sum()) * 50 + 1
+    bens['VR_BEM_CANDIDATO'] = pd.Series(valores.round(2)).map('{:.2f}'.format).str.replace('.', ',', regex=False)
+    return bens
+
+
+def gravar_csv(df, caminho):
+    # Mesmo formato dos arquivos do TSE: ';', latin1 e todos os campos entre aspas
+    df.to_csv(caminho, sep=';', encoding='latin1', index=False, quoting=1)
+
+
+def gerar_arquivos(destino, escala=1, semente=0, por_uf=False, ano=ANO_ELEICAO):
+    os.makedirs(destino, exist_ok=True)
+    candidatos = gerar_candidatos(escala, semente)
+    bens = gerar_bens(candidatos, semente)
+
+    for padrao, df in ((PADRAO_CANDIDATOS, candidatos), (PADRAO_BENS, bens)):
+        if por_uf:
+            for uf, parte in df.groupby('SG_UF', sort=False):
+                gravar_csv(parte, os.path.join(destino, padrao.format(ano=ano, uf=uf)))
+        else:
+            gravar_csv(df, os.path.join(destino, padrao.format(ano=ano, uf='BRASIL')))
+    return len(candidatos), len(bens)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera arquivos sintéticos no formato do TSE.')
+    parser.add_argument('--destino', required=True, help='pasta de saída')
+    parser.add_argument('--escala', type=float, default=1, help='multiplicador do número de candidaturas (1, 5, 10...)')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--por-uf', action='store_true', help='um arquivo por UF em vez do nacional')
+    args = parser.parse_args()
+
+    n_candidatos, n_bens = gerar_arquivos(args.destino, args.escala, args.semente, args.por_uf)
+    print(f'{n_candidatos} candidaturas e {n_bens} bens gravados em {args.destino}')
@@ -0,0 +1,68 @@
+# Medição do tempo de partida e da primeira renderização das páginas
+# O tempo de partida vai do início do processo (lido de /proc no Linux; em outros
+# sistemas, da importação deste módulo, a primeira coisa que os pontos de entrada fazem)
+# até o fim da primeira página renderizada no processo; a primeira renderização de cada
+# página é medida do início ao fim do script dela.
+# Os orçamentos são configuráveis por variável de ambiente; estourar o orçamento gera
+# um aviso no log do servidor.
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def idade_processo():
+    # Segundos desde o início do processo; 0 se o sistema não informa
+    try:
+        with open('/proc/self/stat') as arquivo:
+            # O nome do executável (campo 2) pode ter espaços: os campos vêm depois do ')'
+            campos = arquivo.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as arquivo:
+            ligado = float(arquivo.read().split()[0])
+        return max(ligado - int(campos[19]) / os.sysconf('SC_CLK_TCK'), 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+INICIO_PROCESSO = time.perf_counter() - idade_processo()
+
+# Orçamentos em segundos
+ORCAMENTO_PARTIDA = float(os.environ.get('DASH_ORCAMENTO_PARTIDA', '15'))
+ORCAMENTO_PRIMEIRA_PAGINA = float(os.environ.get('DASH_ORCAMENTO_PRIMEIRA_PAGINA', '5'))
+
+logger = logging.getLogger(__name__)
+
+_trava = threading.Lock()
+_paginas_medidas = set()
+
+
+def verificar_orcamento(nome, segundos, orcamento):
+    if segundos > orcamento:
+        logger.warning('%s levou %.2f s (orçamento: %.2f s)', nome, segundos, orcamento)
+        return False
+    logger.info('%s levou %.2f s', nome, segundos)
+    return True
+
+
+def registrar_pagina(pagina, inicio):
+    # Só a primeira renderização de cada página no processo entra na medição
+    fim = time.perf_counter()
+    with _trava:
+        primeira_do_processo = not _paginas_medidas
+        primeira_da_pagina = pagina not in _paginas_medidas
+        _paginas_medidas.add(pagina)
+    if primeira_do_processo:
+        verificar_orcamento('partida', fim - INICIO_PROCESSO, ORCAMENTO_PARTIDA)
+    if primeira_da_pagina:
+        verificar_orcamento(f'primeira renderização de {pagina}', fim - inicio, ORCAMENTO_PRIMEIRA_PAGINA)
+
+
+@contextmanager
+def medir_pagina(pagina):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar_pagina(pagina, inicio)
@@ -0,0 +1,74 @@
+# Distribuição dos bens declarados por candidato
+# Histograma em escala logarítmica e distribuição acumulada (ECDF) dos totais de bens,
+# com os filtros da página. As contagens por faixa saem do motor de percentis (soma dos
+# esboços dos grupos filtrados): só as faixas com candidatos, algumas dezenas de números,
+# vão para o navegador, nunca um ponto por candidato.
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from metricas import medir
+
+# Rótulos dos eixos nas potências de 10
+ROTULOS_DECADAS = {
+    0: 'R$ 1', 1: 'R$ 10', 2: 'R$ 100', 3: 'R$ 1 mil', 4: 'R$ 10 mil', 5: 'R$ 100 mil',
+    6: 'R$ 1 mi', 7: 'R$ 10 mi', 8: 'R$ 100 mi', 9: 'R$ 1 bi', 10: 'R$ 10 bi',
+}
+
+
+def eixo_reais(figura, decadas):
+    # Eixo x em log10 do valor, com marcas nas potências de 10
+    marcas = [d for d in range(int(np.floor(decadas.min())), int(np.ceil(decadas.max())) + 1) if d in ROTULOS_DECADAS]
+    figura.update_xaxes(tickvals=marcas, ticktext=[ROTULOS_DECADAS[d] for d in marcas], title='Total de Bens')
+
+
+def figura_histograma(histograma):
+    # Barras nas faixas (Mínimo, Máximo], lado a lado no eixo logarítmico
+    inicio = np.log10(histograma['Mínimo'].to_numpy())
+    fim = np.log10(histograma['Máximo'].to_numpy())
+    figura = go.Figure(go.Bar(
+        x=(inicio + fim) / 2, y=histograma['Candidatos'], width=fim - inicio,
+        customdata=histograma[['Mínimo', 'Máximo']].to_numpy(),
+        hovertemplate='R$%{customdata[0]:,.0f} a R$%{customdata[1]:,.0f}<br>%{y} candidatos<extra></extra>',
+    ))
+    figura.update_layout(height=400, bargap=0, title='Candidatos por Faixa de Bens', yaxis_title='Candidatos')
+    eixo_reais(figura, np.append(inicio, fim[-1]))
+    return figura
+
+
+def figura_ecdf(histograma):
+    # Fração acumulada dos candidatos até o fim de cada faixa
+    acumulado = histograma['Candidatos'].cumsum() / histograma['Candidatos'].sum()
+    fim = np.log10(histograma['Máximo'].to_numpy())
+    figura = go.Figure(go.Scatter(
+        x=fim, y=acumulado, mode='lines', line_shape='hv',
+        customdata=histograma['Máximo'], hovertemplate='até R$%{customdata:,.0f}: %{y:.1%}<extra></extra>',
+    ))
+    figura.update_layout(height=400, title='Distribuição Acumulada dos Bens', yaxis_tickformat='.0%', yaxis_range=[0, 1])
+    eixo_reais(figura, fim)
+    return figura
+
+
+def exibir_distribuicao_bens(motor, filtros):
+    # filtros no formato do cubo (inclui 'Cargo')
+    histograma = motor.histograma(filtros)
+    if histograma is None:
+        return
+    abaixo = int(histograma.loc[histograma['Mínimo'] == 0, 'Candidatos'].sum())
+    histograma = histograma[histograma['Mínimo'] > 0]
+    if len(histograma) == 0:
+        return
+
+    with medir('gráficos: construção'):
+        fig_histograma = figura_histograma(histograma)
+        fig_ecdf = figura_ecdf(histograma)
+    col1, col2 = st.columns(2)
+    with col1:
+        with medir('gráficos: envio'):
+            st.plotly_chart(fig_histograma, use_container_width=True)
+    with col2:
+        with medir('gráficos: envio'):
+            st.plotly_chart(fig_ecdf, use_container_width=True)
+    if abaixo:
+        st.caption(f'{abaixo:,} candidatos com menos de R$ 1 em bens ficam fora dos gráficos.'.replace(',', '.'))
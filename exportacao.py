@@ -0,0 +1,123 @@
+# Exportação do resultado filtrado em CSV (UTF-8 ou Latin-1) e Parquet
+# As linhas saem da base em blocos de LINHAS_POR_BLOCO, na ordem da tabela, e cada bloco
+# é codificado direto no arquivo de saída (um temporário, em disco acima de
+# TAMANHO_EM_MEMORIA): nunca existe um DataFrame nem um texto com o resultado inteiro, e
+# os bytes finais são lidos do temporário uma única vez. O pico de memória fica no
+# tamanho do arquivo mais um bloco, mesmo para "todos os vereadores de SP".
+# Os bytes das exportações recentes ficam num LRU limitado em bytes
+# (DASH_CACHE_EXPORTACOES_MB), compartilhado entre sessões: a chave é a base (o ano), o
+# formato e o conteúdo dos ids ordenados.
+
+import hashlib
+import io
+import os
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import streamlit as st
+
+from cache_resultados import CacheLRU
+from leitura_tse import ANO_ELEICAO
+from metricas import medir, registrar_estatisticas
+
+LIMITE_BYTES = int(float(os.environ.get('DASH_CACHE_EXPORTACOES_MB', '128')) * 2**20)
+
+LINHAS_POR_BLOCO = 50_000
+
+# Exportações até este tamanho não passam pelo disco
+TAMANHO_EM_MEMORIA = 8 * 2**20
+
+FORMATOS = {
+    'CSV (UTF-8)': {'extensao': 'csv', 'mime': 'text/csv', 'codificacao': 'utf-8'},
+    'CSV (Latin-1)': {'extensao': 'csv', 'mime': 'text/csv', 'codificacao': 'latin-1'},
+    'Parquet': {'extensao': 'parquet', 'mime': 'application/vnd.apache.parquet'},
+}
+
+
+def blocos(base, ids, colunas):
+    # Tabelas Arrow de até LINHAS_POR_BLOCO linhas, na ordem dos ids
+    if ids is None:
+        ids = np.arange(len(base))
+    for inicio in range(0, max(len(ids), 1), LINHAS_POR_BLOCO):
+        yield base.recorte(ids[inicio:inicio + LINHAS_POR_BLOCO], colunas)
+
+
+def escrever_csv(saida, base, ids, colunas, codificacao):
+    if codificacao == 'utf-8':
+        # Um só escritor do Arrow, direto na saída
+        escritor = None
+        for bloco in blocos(base, ids, colunas):
+            if escritor is None:
+                escritor = pa_csv.CSVWriter(saida, bloco.schema)
+            escritor.write_table(bloco)
+        escritor.close()
+        return
+
+    # O Arrow só escreve UTF-8: cada bloco é recodificado (caracteres sem equivalente
+    # viram '?'), lido do buffer do bloco sem cópia
+    for numero, bloco in enumerate(blocos(base, ids, colunas)):
+        parte = io.BytesIO()
+        pa_csv.write_csv(bloco, parte, pa_csv.WriteOptions(include_header=numero == 0))
+        saida.write(str(parte.getbuffer(), 'utf-8').encode(codificacao, errors='replace'))
+
+
+def escrever_parquet(saida, base, ids, colunas):
+    # Um row group por bloco; as colunas categóricas continuam como dicionário
+    escritor = None
+    for bloco in blocos(base, ids, colunas):
+        if escritor is None:
+            escritor = pq.ParquetWriter(saida, bloco.schema, compression='zstd')
+        escritor.write_table(bloco)
+    escritor.close()
+
+
+def gerar_exportacao(base, ids, colunas, formato):
+    with medir(f'exportação: {formato}'), tempfile.SpooledTemporaryFile(TAMANHO_EM_MEMORIA) as arquivo:
+        saida = pa.PythonFile(arquivo, mode='w')
+        if FORMATOS[formato]['extensao'] == 'parquet':
+            escrever_parquet(saida, base, ids, colunas)
+        else:
+            escrever_csv(saida, base, ids, colunas, FORMATOS[formato]['codificacao'])
+        arquivo.seek(0)
+        return arquivo.read()
+
+
+def chave_exportacao(base, ids, colunas, formato):
+    # Resultados com as mesmas linhas da mesma base, na mesma ordem, dão o mesmo arquivo
+    resumo = 'todas' if ids is None else hashlib.blake2b(np.ascontiguousarray(ids, dtype=np.int64)).hexdigest()
+    return base.pasta, formato, tuple(colunas), resumo
+
+
+@st.cache_resource
+def carregar_cache_exportacoes():
+    cache = CacheLRU(LIMITE_BYTES)
+    registrar_estatisticas('cache_exportacoes', cache.estatisticas)
+    return cache
+
+
+def exportar(base, ids, colunas, formato):
+    cache = carregar_cache_exportacoes()
+    chave = chave_exportacao(base, ids, colunas, formato)
+    dados = cache.obter(chave)
+    if dados is None:
+        dados = gerar_exportacao(base, ids, colunas, formato)
+        cache.guardar(chave, dados)
+    return dados
+
+
+def exibir_exportacao(cargo, tabela, ids_ordenados, ano=ANO_ELEICAO):
+    # Escolha do formato e botão de download; o arquivo só é gerado no clique
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        formato = st.selectbox('Formato', list(FORMATOS), key=f'formato_{cargo}', label_visibility='collapsed')
+    with col2:
+        st.download_button(
+            'Baixar resultado completo',
+            data=lambda: exportar(tabela.base, ids_ordenados, tabela.colunas, formato),
+            file_name=f'candidatos_{cargo.lower()}_{ano}.{FORMATOS[formato]["extensao"]}',
+            mime=FORMATOS[formato]['mime'],
+            key=f'download_{cargo}',
+        )
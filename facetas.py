@@ -0,0 +1,118 @@
+# Filtros facetados das páginas
+# As listas de opções de cada cargo (já ordenadas) e o mapa UF -> cidades são montados
+# uma vez por processo a partir do cubo de contagens. A cada execução, as contagens de
+# todas as opções saem de uma só passada pelas células do cubo: cada campo é contado
+# sob os filtros dos outros campos, e o rótulo da opção mostra quantas candidaturas ela
+# tem com o que já foi escolhido, ex.: 'PT (1.234)'.
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from cubo_contagens import carregar_cubo
+from leitura_tse import ANO_ELEICAO
+from metricas import medir
+
+# Campo da base, rótulo do multiselect
+CAMPOS_FACETA = {'UF': 'Estado', 'Cidade': 'Cidade', 'Partido': 'Partido', 'Gênero': 'Gênero'}
+
+
+def contar_facetas(cubo, filtros, campos):
+    # Contagem de cada campo sob os filtros dos demais campos (o filtro do próprio campo
+    # é ignorado). Os filtros fora de `campos` (ex.: Cargo) restringem as células uma vez;
+    # depois cada filtro vira uma máscara e cada campo, um bincount ponderado.
+    indice = cubo.indice
+    fixos = {c: v for c, v in filtros.items() if c not in campos}
+    celulas = indice.filtrar(fixos)
+    if celulas is None:
+        celulas = np.arange(len(cubo.contagens))
+    contagens = cubo.contagens[celulas]
+
+    mascaras = {
+        campo: indice.mascara_valores(campo, filtros[campo])[indice.codigos[campo][celulas]]
+        for campo in campos if filtros.get(campo)
+    }
+
+    resultado = {}
+    for campo in campos:
+        outras = [mascara for c, mascara in mascaras.items() if c != campo]
+        pesos = contagens * np.logical_and.reduce(outras) if outras else contagens
+        categorias = indice.categorias[campo]
+        soma = np.bincount(indice.codigos[campo][celulas], weights=pesos, minlength=len(categorias) + 1)[1:]
+        resultado[campo] = pd.Series(soma.astype(np.int64), index=categorias)
+    return resultado
+
+
+class Facetas:
+    def __init__(self, cubo, cargos):
+        self.cubo = cubo
+        self.opcoes = {}
+        self.cidades_por_uf = {}
+        for cargo in cargos:
+            filtro = {'Cargo': [cargo]}
+            self.opcoes[cargo] = {
+                campo: sorted(cubo.contar(campo, filtro).index) for campo in CAMPOS_FACETA
+            }
+            # Cidades de cada UF, já ordenadas
+            indice = cubo.indice
+            celulas = indice.filtrar(filtro)
+            pares = pd.DataFrame({
+                campo: np.asarray(indice.categorias[campo], dtype=object)[indice.codigos[campo][celulas] - 1]
+                for campo in ('UF', 'Cidade')
+            }).drop_duplicates()
+            self.cidades_por_uf[cargo] = {uf: sorted(cidades) for uf, cidades in pares.groupby('UF')['Cidade']}
+
+    def opcoes_cidade(self, cargo, ufs):
+        if not ufs:
+            return self.opcoes[cargo]['Cidade']
+        por_uf = self.cidades_por_uf[cargo]
+        # Cidades homônimas em UFs diferentes (ex.: SANTA LUZIA, MG e PB) aparecem uma vez
+        return sorted({cidade for uf in ufs for cidade in por_uf.get(uf, [])})
+
+    def contagens(self, cargo, filtros):
+        with medir('facetas'):
+            return contar_facetas(self.cubo, {**filtros, 'Cargo': [cargo]}, list(CAMPOS_FACETA))
+
+
+@st.cache_resource
+def carregar_facetas(ano=ANO_ELEICAO):
+    cubo = carregar_cubo(ano)
+    return Facetas(cubo, list(cubo.contar('Cargo', {}).index))
+
+
+def rotulo_opcao(valor, contagem):
+    # 'PT (1.234)': separador de milhar brasileiro
+    return f'{valor} ({contagem:,})'.replace(',', '.')
+
+
+def exibir_filtros(cargo, ano=ANO_ELEICAO):
+    # Multiselects de Estado, Cidade, Partido e Gênero com a contagem de cada opção.
+    # As seleções vêm do session_state (têm chave), então as contagens já consideram
+    # o que o usuário escolheu antes de os widgets serem desenhados.
+    # As chaves não dependem do ano: ao trocar de eleição, a seleção continua valendo.
+    facetas = carregar_facetas(ano)
+    chaves = {campo: f'filtro_{campo}_{cargo}' for campo in CAMPOS_FACETA}
+    selecao = {campo: st.session_state.get(chave, []) for campo, chave in chaves.items()}
+
+    opcoes = dict(facetas.opcoes[cargo])
+    opcoes['Cidade'] = facetas.opcoes_cidade(cargo, selecao['UF'])
+
+    # Cidades de um estado que saiu da seleção (ou valores que não existem na eleição
+    # escolhida, ex.: partidos extintos) deixam de ser opção
+    for campo in CAMPOS_FACETA:
+        validas = set(opcoes[campo])
+        if any(valor not in validas for valor in selecao[campo]):
+            selecao[campo] = [valor for valor in selecao[campo] if valor in validas]
+            st.session_state[chaves[campo]] = selecao[campo]
+
+    contagens = facetas.contagens(cargo, selecao)
+
+    filtros = {}
+    colunas = st.columns(2) + st.columns(2)
+    for coluna, (campo, rotulo) in zip(colunas, CAMPOS_FACETA.items()):
+        with coluna:
+            filtros[campo] = st.multiselect(
+                rotulo, options=opcoes[campo], key=chaves[campo],
+                format_func=lambda valor, campo=campo: rotulo_opcao(valor, contagens[campo].get(valor, 0)),
+            )
+    return filtros
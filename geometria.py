@@ -0,0 +1,132 @@
+# Geometria simplificada dos mapas
+# Etapa de build: lê o shapefile das UFs com geopandas, simplifica os polígonos
+# preservando as divisas entre estados, arredonda as coordenadas e grava um GeoJSON
+# compacto com os atributos do mapa. Em execução, o dashboard só lê esse GeoJSON
+# (com o módulo json), sem depender de geopandas: as dependências do build ficam em
+# requirements-build.txt (shapely>=2.1 para coverage_simplify).
+# A malha municipal (IBGE) é gravada em um GeoJSON por UF, carregado só quando o
+# estado é selecionado.
+# Uso: python geometria.py [--nivel uf|municipios] [--tolerancia 0.01] [--casas 3]
+
+import argparse
+import json
+import os
+
+import pandas as pd
+
+from leitura_tse import normalizar_texto
+
+ARQUIVO_SHAPE_UF = 'base_dashboard/brasil_genero.shp'
+ARQUIVO_GEOJSON_UF = 'base_dashboard/brasil_genero_uf.geojson'
+
+# Atributos mantidos no GeoJSON das UFs
+ATRIBUTOS_UF = ['SIGLA_UF', 'NM_UF', 'FEMININO', 'MASCULINO', '% FEMININO']
+
+# Malha municipal do IBGE e pasta dos GeoJSON por UF
+ARQUIVO_SHAPE_MUNICIPIOS = 'base_dashboard/BR_Municipios_2022.shp'
+PASTA_MUNICIPIOS = 'base_dashboard/municipios'
+
+# Atributos mantidos nos GeoJSON municipais; CHAVE junta UF e nome normalizado,
+# que é como o município aparece na base de candidatos (NM_UE, SG_UF)
+ATRIBUTOS_MUNICIPIOS = ['CHAVE', 'CD_MUN', 'NM_MUN', 'SIGLA_UF']
+
+# Tolerância de simplificação (em graus) e casas decimais das coordenadas
+TOLERANCIA = 0.01
+CASAS_DECIMAIS = 3
+TOLERANCIA_MUNICIPIOS = 0.002
+CASAS_DECIMAIS_MUNICIPIOS = 4
+
+
+def simplificar(geometrias, tolerancia):
+    # Simplificação de cobertura: divisas compartilhadas são simplificadas uma única vez,
+    # sem abrir buracos nem sobreposições entre vizinhos
+    import shapely
+
+    if hasattr(shapely, 'coverage_simplify'):
+        return shapely.coverage_simplify(geometrias.values, tolerancia)
+    return geometrias.simplify(tolerancia, preserve_topology=True).values
+
+
+def quantizar(geometrias, casas):
+    # Arredonda as coordenadas para uma grade fixa, mantendo as geometrias válidas
+    import shapely
+
+    return shapely.set_precision(geometrias, 10 ** -casas)
+
+
+def gravar_geojson(gdf, destino, atributos):
+    # GeoJSON sem espaços (as coordenadas já chegam quantizadas)
+    colecao = json.loads(gdf[atributos + ['geometry']].to_json(drop_id=True))
+    with open(destino, 'w', encoding='utf-8') as arquivo:
+        json.dump(colecao, arquivo, ensure_ascii=False, separators=(',', ':'))
+    return colecao
+
+
+def construir_geojson_uf(origem=ARQUIVO_SHAPE_UF, destino=ARQUIVO_GEOJSON_UF,
+                         tolerancia=TOLERANCIA, casas=CASAS_DECIMAIS):
+    import geopandas as gpd
+
+    gdf = gpd.read_file(origem).to_crs(epsg=4326)
+    gdf['geometry'] = quantizar(simplificar(gdf.geometry, tolerancia), casas)
+    return gravar_geojson(gdf, destino, ATRIBUTOS_UF)
+
+
+def chave_municipio(uf, nome):
+    return f'{uf}|{normalizar_texto(nome)}'
+
+
+def arquivo_municipios(uf, pasta=PASTA_MUNICIPIOS):
+    return os.path.join(pasta, f'{uf}.geojson')
+
+
+def construir_geojson_municipios(origem=ARQUIVO_SHAPE_MUNICIPIOS, pasta=PASTA_MUNICIPIOS,
+                                 tolerancia=TOLERANCIA_MUNICIPIOS, casas=CASAS_DECIMAIS_MUNICIPIOS):
+    import geopandas as gpd
+
+    gdf = gpd.read_file(origem).to_crs(epsg=4326)
+    gdf['CHAVE'] = [chave_municipio(uf, nome) for uf, nome in zip(gdf['SIGLA_UF'], gdf['NM_MUN'])]
+
+    # A cobertura é simplificada de uma vez, para que as divisas entre estados também casem
+    gdf['geometry'] = quantizar(simplificar(gdf.geometry, tolerancia), casas)
+
+    os.makedirs(pasta, exist_ok=True)
+    ufs = []
+    for uf, gdf_uf in gdf.groupby('SIGLA_UF'):
+        gravar_geojson(gdf_uf, arquivo_municipios(uf, pasta), ATRIBUTOS_MUNICIPIOS)
+        ufs.append(uf)
+    return ufs
+
+
+def ler_geojson(caminho):
+    # Retorna o GeoJSON e um DataFrame com os atributos de cada feição
+    with open(caminho, encoding='utf-8') as arquivo:
+        geojson = json.load(arquivo)
+    atributos = pd.DataFrame([feicao['properties'] for feicao in geojson['features']])
+    return geojson, atributos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera a geometria simplificada dos mapas')
+    parser.add_argument('--nivel', choices=['uf', 'municipios'], default='uf')
+    parser.add_argument('--origem', help='shapefile de origem')
+    parser.add_argument('--destino', help='GeoJSON (uf) ou pasta (municipios) de destino')
+    parser.add_argument('--tolerancia', type=float, help='tolerância em graus')
+    parser.add_argument('--casas', type=int, help='casas decimais das coordenadas')
+    args = parser.parse_args()
+
+    if args.nivel == 'uf':
+        colecao = construir_geojson_uf(
+            args.origem or ARQUIVO_SHAPE_UF, args.destino or ARQUIVO_GEOJSON_UF,
+            args.tolerancia or TOLERANCIA, args.casas or CASAS_DECIMAIS,
+        )
+        print(f"{len(colecao['features'])} UFs gravadas em {args.destino or ARQUIVO_GEOJSON_UF}")
+    else:
+        ufs = construir_geojson_municipios(
+            args.origem or ARQUIVO_SHAPE_MUNICIPIOS, args.destino or PASTA_MUNICIPIOS,
+            args.tolerancia or TOLERANCIA_MUNICIPIOS, args.casas or CASAS_DECIMAIS_MUNICIPIOS,
+        )
+        print(f'{len(ufs)} UFs gravadas em {args.destino or PASTA_MUNICIPIOS}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+# Índice invertido para os filtros de Estado, Cidade, Partido e Gênero
+# Para cada campo guarda, por valor, a lista ordenada das linhas que têm esse valor.
+# Um filtro vira união (OU) das listas dentro do campo e interseção (E) entre campos,
+# sem varrer a tabela inteira.
+# Sobre a base de candidatos os arrays do índice ficam gravados ao lado da tabela e são
+# abertos por mapeamento de memória, compartilhados entre processos; os filtros
+# retornam fatias desses arrays ou arrays de ids, nunca cópias das linhas.
+# A base é gravada em partições de cargo e UF (faixas contíguas de linhas): filtros
+# nesses campos viram as faixas das partições que casam, e os demais filtros só
+# consultam os códigos das linhas dessas faixas.
+
+import numpy as np
+import streamlit as st
+
+from base_candidatos import BaseCandidatos, carregar_candidatos
+from leitura_tse import ANO_ELEICAO
+from metricas import medir
+
+# Campos com índice (nomes de exibição da base de candidatos)
+CAMPOS_FILTRO = ['Cargo', 'UF', 'Cidade', 'Partido', 'Gênero']
+
+# Versão do formato dos arrays do índice gravados com a base (sobe quando ele muda)
+VERSAO_INDICE = 1
+
+
+def arrays_indice(codigos, n_categorias):
+    # Códigos deslocados em 1: o código 0 marca valor ausente
+    codigos = (np.asarray(codigos) + 1).astype(np.int32)
+
+    # Linhas agrupadas por código; o argsort estável mantém cada lista ordenada
+    ordem = np.argsort(codigos, kind='stable').astype(np.int64)
+    contagem = np.bincount(codigos, minlength=n_categorias + 1)
+    inicios = np.concatenate([[0], np.cumsum(contagem)])
+    return {'codigos': codigos, 'linhas': ordem, 'inicios': inicios}
+
+
+def concatenar_faixas(inicios, fins):
+    # Linhas das faixas [inicio, fim), em sequência, sem laço em Python
+    tamanhos = fins - inicios
+    deslocamento = inicios - np.concatenate([[0], np.cumsum(tamanhos)[:-1]])
+    return np.arange(tamanhos.sum(), dtype=np.int64) + np.repeat(deslocamento, tamanhos)
+
+
+class IndiceFiltros:
+    def __init__(self, df, campos=CAMPOS_FILTRO):
+        self.n_linhas = len(df)
+        self.categorias = {}
+        self.posicoes = {}
+        self.codigos = {}
+        self.linhas = {}
+        self.inicios = {}
+
+        for campo in campos:
+            if isinstance(df, BaseCandidatos):
+                categorias = df.categorias(campo)
+                arrays = df.derivado(
+                    f'indice {campo}', lambda: arrays_indice(df.codigos(campo), len(categorias)),
+                    VERSAO_INDICE,
+                )
+            else:
+                coluna = df[campo].astype('category')
+                categorias = list(coluna.cat.categories)
+                arrays = arrays_indice(coluna.cat.codes.to_numpy(), len(categorias))
+
+            self.categorias[campo] = categorias
+            self.posicoes[campo] = {valor: i + 1 for i, valor in enumerate(categorias)}
+            self.codigos[campo] = arrays['codigos']
+            self.linhas[campo] = arrays['linhas']
+            self.inicios[campo] = arrays['inicios']
+
+        # Partições da base: código de cada campo de partição e faixa de linhas
+        self.particoes = None
+        particoes = df.particoes() if isinstance(df, BaseCandidatos) else None
+        if particoes is not None and all(campo in campos for campo in particoes['campos']):
+            self.particoes = {
+                'codigos': {
+                    campo: np.array([self.posicoes[campo][valores[i]] for valores in particoes['valores']])
+                    for i, campo in enumerate(particoes['campos'])
+                },
+                'faixas': np.asarray(particoes['faixas'], dtype=np.int64).reshape(-1, 2),
+            }
+
+    def _codigos_valores(self, campo, valores):
+        posicoes = self.posicoes[campo]
+        return [posicoes[v] for v in valores if v in posicoes]
+
+    def tamanho(self, campo, valores):
+        # Número de linhas que casam com os valores do campo, sem materializar nada
+        inicios = self.inicios[campo]
+        return int(sum(inicios[c + 1] - inicios[c] for c in self._codigos_valores(campo, valores)))
+
+    def linhas_do_valor(self, campo, valor):
+        codigo = self.posicoes[campo].get(valor)
+        if codigo is None:
+            return np.empty(0, dtype=np.int64)
+        inicios = self.inicios[campo]
+        return self.linhas[campo][inicios[codigo]:inicios[codigo + 1]]
+
+    def linhas_do_campo(self, campo, valores):
+        # União (OU) dentro do campo: as listas são disjuntas, basta concatenar e ordenar
+        partes = [self.linhas_do_valor(campo, v) for v in valores]
+        if not partes:
+            return np.empty(0, dtype=np.int64)
+        if len(partes) == 1:
+            return partes[0]
+        return np.sort(np.concatenate(partes))
+
+    def mascara_valores(self, campo, valores):
+        # Tabela de consulta código -> selecionado
+        mascara = np.zeros(len(self.categorias[campo]) + 1, dtype=bool)
+        mascara[self._codigos_valores(campo, valores)] = True
+        return mascara
+
+    def filtrar(self, filtros):
+        # Retorna os ids de linha (ordenados) que passam em todos os filtros,
+        # ou None quando nenhum filtro está ativo (todas as linhas)
+        ativos = {campo: valores for campo, valores in filtros.items() if valores}
+        if not ativos:
+            return None
+
+        # Começa pelo campo mais seletivo (ou pelas partições de cargo e UF, se forem
+        # menores) e refina pelos demais consultando os códigos apenas das linhas
+        # candidatas: o custo acompanha o tamanho do resultado
+        with medir('filtros (índice)'):
+            menor = min(ativos, key=lambda campo: self.tamanho(campo, ativos[campo]))
+            faixas = self.faixas_particoes(ativos)
+            if faixas is not None and (faixas[:, 1] - faixas[:, 0]).sum() < self.tamanho(menor, ativos[menor]):
+                ids = concatenar_faixas(faixas[:, 0], faixas[:, 1])
+                return self.restringir(ids, {c: v for c, v in ativos.items() if c not in self.particoes['codigos']})
+            ids = self.linhas_do_campo(menor, ativos[menor])
+            return self.restringir(ids, {c: v for c, v in ativos.items() if c != menor})
+
+    def faixas_particoes(self, filtros):
+        # Faixas [início, fim) das partições que passam nos filtros dos campos de partição,
+        # em ordem de linha; None sem partições ou sem filtro nesses campos
+        if self.particoes is None or not any(filtros.get(campo) for campo in self.particoes['codigos']):
+            return None
+        selecionadas = np.ones(len(self.particoes['faixas']), dtype=bool)
+        for campo, codigos in self.particoes['codigos'].items():
+            if filtros.get(campo):
+                selecionadas &= self.mascara_valores(campo, filtros[campo])[codigos]
+        return self.particoes['faixas'][selecionadas]
+
+    def restringir(self, ids, filtros):
+        # Mantém, dentre os ids dados (ordenados), os que passam nos filtros ativos
+        for campo, valores in filtros.items():
+            if not valores or len(ids) == 0:
+                continue
+            ids = ids[self.mascara_valores(campo, valores)[self.codigos[campo][ids]]]
+        return ids
+
+
+@st.cache_resource
+def carregar_indice(ano=ANO_ELEICAO):
+    return IndiceFiltros(carregar_candidatos(ano))
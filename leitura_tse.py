@@ -0,0 +1,191 @@
+# Leitura dos arquivos brutos do TSE
+# Localiza os arquivos de candidatos e de bens (nacional ou por UF) e lê em blocos,
+# para que arquivos de centenas de MB não precisem caber inteiros na memória.
+# A ingestão da base (base_candidatos.py) usa o leitor de CSV do Arrow: o arquivo
+# nacional é analisado em várias threads e os arquivos por UF, um por processo. A
+# codificação de cada arquivo é detectada (Latin-1 do TSE ou UTF-8) e os marcadores de
+# campo vazio do TSE viram nulos.
+
+import os
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+ANO_ELEICAO = 2024
+
+# Eleições municipais com o mesmo layout de arquivos do TSE
+ANOS_ELEICOES = [2016, 2020, 2024]
+
+# Nomes dos arquivos publicados pelo TSE
+PADRAO_CANDIDATOS = 'consulta_cand_{ano}_{uf}.csv'
+PADRAO_BENS = 'bem_candidato_{ano}_{uf}.csv'
+
+UFS = [
+    'AC', 'AL', 'AM', 'AP', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA', 'MG', 'MS', 'MT', 'PA',
+    'PB', 'PE', 'PI', 'PR', 'RJ', 'RN', 'RO', 'RR', 'RS', 'SC', 'SE', 'SP', 'TO',
+]
+
+# Chave do candidato, comum aos arquivos de candidatos e de bens
+CHAVE_CANDIDATO = 'SQ_CANDIDATO'
+
+TAMANHO_BLOCO = 200_000
+
+# Bytes de CSV por lote do leitor do Arrow
+BYTES_POR_LOTE = 16 << 20
+
+# Marcadores do TSE para campo vazio (#NULO#, -1) e não divulgável (#NE#, -3)
+VALORES_AUSENTES = ['#NULO#', '#NE#', '-1', '-3']
+
+# Valor único no lugar dos marcadores nos campos de texto (base e agregados)
+VALOR_AUSENTE = '#NULO#'
+
+
+def arquivos_tse(diretorio, padrao, ano=ANO_ELEICAO):
+    # Retorna {partição: caminho}: o arquivo nacional ('BRASIL') ou os arquivos por UF
+    nacional = os.path.join(diretorio, padrao.format(ano=ano, uf='BRASIL'))
+    if os.path.exists(nacional):
+        return {'BRASIL': nacional}
+
+    arquivos = {}
+    for uf in UFS:
+        caminho = os.path.join(diretorio, padrao.format(ano=ano, uf=uf))
+        if os.path.exists(caminho):
+            arquivos[uf] = caminho
+    return arquivos
+
+
+def ler_em_blocos(caminho, colunas, tamanho_bloco=TAMANHO_BLOCO):
+    # Lê só as colunas pedidas, como texto, em blocos de linhas; os marcadores do TSE
+    # viram nulos, como no leitor do Arrow (opcoes_csv)
+    codificacao = 'utf-8-sig' if detectar_codificacao(caminho) == 'utf8' else 'latin1'
+    return pd.read_csv(
+        caminho, sep=';', encoding=codificacao, usecols=colunas, dtype=str, chunksize=tamanho_bloco,
+        na_values=VALORES_AUSENTES, keep_default_na=False,
+    )
+
+
+def ler_candidatos(caminho, colunas, tamanho_bloco=TAMANHO_BLOCO):
+    # Campos de texto vazios recebem VALOR_AUSENTE, os mesmos grupos da base de candidatos
+    blocos = ler_em_blocos(caminho, colunas, tamanho_bloco)
+    df = pd.concat(blocos, ignore_index=True)
+    df[CHAVE_CANDIDATO] = df[CHAVE_CANDIDATO].astype('int64')
+    texto = [coluna for coluna in df.columns if coluna != CHAVE_CANDIDATO]
+    df[texto] = df[texto].fillna(VALOR_AUSENTE)
+    return df
+
+
+def totais_bens(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    # Soma, número de itens e maior item declarado por candidato.
+    # Cada bloco é reduzido por candidato; as reduções parciais são combinadas no final,
+    # o que também resolve candidatos cujos bens caem em blocos diferentes.
+    parciais = []
+    for bloco in ler_em_blocos(caminho, [CHAVE_CANDIDATO, 'VR_BEM_CANDIDATO'], tamanho_bloco):
+        valores = pd.to_numeric(bloco['VR_BEM_CANDIDATO'].str.replace(',', '.', regex=False))
+        chaves = bloco[CHAVE_CANDIDATO].astype('int64')
+        parciais.append(valores.groupby(chaves).agg(['sum', 'count', 'max']))
+
+    if not parciais:
+        return pd.DataFrame(columns=['total', 'itens', 'maior'], index=pd.Index([], name=CHAVE_CANDIDATO))
+
+    parciais = pd.concat(parciais)
+    totais = parciais.groupby(level=0).agg({'sum': 'sum', 'count': 'sum', 'max': 'max'})
+    totais.columns = ['total', 'itens', 'maior']
+    totais.index.name = CHAVE_CANDIDATO
+    return totais
+
+
+def detectar_codificacao(caminho, amostra=1 << 20):
+    # O TSE publica em Latin-1; arquivos regravados em UTF-8 também são aceitos.
+    # Uma amostra do começo do arquivo que decodifica como UTF-8 decide (se o resto do
+    # arquivo não for UTF-8, os leitores do Arrow releem em Latin-1)
+    with open(caminho, 'rb') as arquivo:
+        dados = arquivo.read(amostra)
+    if len(dados) == amostra:
+        # Termina na última linha completa, para não cortar um caractere ao meio
+        dados = dados[:dados.rfind(b'\n') + 1]
+    try:
+        dados.decode('utf-8')
+    except UnicodeDecodeError:
+        return 'latin1'
+    return 'utf8'
+
+
+def opcoes_csv(caminho, colunas, threads=True, codificacao=None):
+    # Opções do leitor do Arrow: só as colunas pedidas que existem no arquivo, todas como
+    # texto, e os marcadores do TSE como nulos
+    codificacao = codificacao or detectar_codificacao(caminho)
+    with open(caminho, encoding='utf-8-sig' if codificacao == 'utf8' else codificacao) as arquivo:
+        cabecalho = [coluna.strip('"') for coluna in arquivo.readline().rstrip('\r\n').split(';')]
+    presentes = [coluna for coluna in cabecalho if coluna in colunas]
+    return (
+        pa_csv.ReadOptions(encoding=codificacao, use_threads=threads, block_size=BYTES_POR_LOTE),
+        pa_csv.ParseOptions(delimiter=';'),
+        pa_csv.ConvertOptions(
+            include_columns=presentes, column_types=dict.fromkeys(presentes, pa.string()),
+            null_values=VALORES_AUSENTES, strings_can_be_null=True, quoted_strings_can_be_null=True,
+        ),
+    )
+
+
+def ler_tabela(caminho, colunas, threads=True):
+    # Arquivo inteiro numa tabela Arrow; com threads, os lotes são analisados em paralelo
+    codificacao = detectar_codificacao(caminho)
+    try:
+        return pa_csv.read_csv(caminho, *opcoes_csv(caminho, colunas, threads, codificacao))
+    except pa.ArrowInvalid:
+        # UTF-8 inválido depois da amostra: o arquivo é Latin-1
+        if codificacao == 'latin1':
+            raise
+        return pa_csv.read_csv(caminho, *opcoes_csv(caminho, colunas, threads, 'latin1'))
+
+
+def ler_lotes(caminho, colunas):
+    # Tabelas de um lote cada (BYTES_POR_LOTE de CSV), sem o arquivo inteiro na memória
+    codificacao = detectar_codificacao(caminho)
+    entregues = 0
+    try:
+        for lote in pa_csv.open_csv(caminho, *opcoes_csv(caminho, colunas, codificacao=codificacao)):
+            entregues += lote.num_rows
+            yield pa.Table.from_batches([lote])
+    except pa.ArrowInvalid:
+        if codificacao == 'latin1':
+            raise
+        # Relê em Latin-1, pulando as linhas já entregues (só ASCII até ali, iguais nas
+        # duas codificações); os lotes podem cair em outras posições, por isso a contagem
+        pular = entregues
+        for lote in pa_csv.open_csv(caminho, *opcoes_csv(caminho, colunas, codificacao='latin1')):
+            if pular >= lote.num_rows:
+                pular -= lote.num_rows
+                continue
+            yield pa.Table.from_batches([lote.slice(pular)])
+            pular = 0
+
+
+def ler_particoes(arquivos, colunas, processos=None):
+    # Um arquivo (nacional): leitor multithread. Vários (por UF): um processo por arquivo,
+    # cada um com uma thread; as partes voltam na ordem dos arquivos
+    if len(arquivos) == 1:
+        return ler_tabela(arquivos[0], colunas)
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        partes = list(executor.map(partial(ler_tabela, colunas=colunas, threads=False), arquivos))
+    return pa.concat_tables(partes, promote_options='default')
+
+
+def lotes_particoes(arquivos, colunas, processos=None):
+    # Como ler_particoes, mas entrega as partes à medida que ficam prontas (lotes do
+    # arquivo nacional ou um arquivo de UF por vez), para gravação em fluxo
+    if len(arquivos) == 1:
+        yield from ler_lotes(arquivos[0], colunas)
+        return
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        yield from executor.map(partial(ler_tabela, colunas=colunas, threads=False), arquivos)
+
+
+def normalizar_texto(texto):
+    # Maiúsculas, sem acentos e com espaços simples: 'São  João' -> 'SAO JOAO'
+    sem_acento = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sem_acento.upper().split())
@@ -0,0 +1,95 @@
+# Mapa de candidaturas femininas com nível de detalhe
+# Sem estado selecionado o mapa mostra as UFs; com estado(s) selecionado(s) carrega a
+# malha municipal simplificada só dessas UFs (um GeoJSON por UF, gerado por geometria.py).
+# As proporções saem do cubo de contagens, respeitando os filtros da página.
+
+import os
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from geometria import ARQUIVO_GEOJSON_UF, arquivo_municipios, chave_municipio, ler_geojson
+from metricas import medir
+
+ESCALA_CORES = 'Viridis'
+
+
+@st.cache_resource(show_spinner=False)
+def carregar_geojson_uf():
+    if not os.path.exists(ARQUIVO_GEOJSON_UF):
+        return None
+    return ler_geojson(ARQUIVO_GEOJSON_UF)[0]
+
+
+# No máximo uma entrada por UF; cada arquivo só é lido na primeira vez que o estado é escolhido
+@st.cache_resource(max_entries=27, show_spinner=False)
+def carregar_geojson_municipios(uf):
+    caminho = arquivo_municipios(uf)
+    if not os.path.exists(caminho):
+        return None
+    return ler_geojson(caminho)[0]
+
+
+def proporcao_feminina(cubo, dimensao, filtros):
+    # Candidaturas totais, femininas e % feminino por valor da dimensão
+    filtros = {campo: valores for campo, valores in filtros.items() if campo != 'Gênero'}
+    total = cubo.contar(dimensao, filtros)
+    femininas = cubo.contar(dimensao, {**filtros, 'Gênero': ['FEMININO']})
+    df = pd.DataFrame({'Candidaturas': total, 'Femininas': femininas}).fillna(0)
+    df['% Feminino'] = df['Femininas'] / df['Candidaturas']
+    return df.rename_axis(dimensao).reset_index()
+
+
+def figura_choropleth(dados, geojson, chave, hover):
+    fig = px.choropleth(
+        dados, geojson=geojson, locations=chave, featureidkey=f'properties.{chave}',
+        color='% Feminino', color_continuous_scale=ESCALA_CORES, range_color=(0, 0.5),
+        hover_name=hover, hover_data={chave: False, 'Candidaturas': True, 'Femininas': True},
+    )
+    fig.update_geos(fitbounds='locations', visible=False)
+    fig.update_layout(margin={'r': 0, 't': 0, 'l': 0, 'b': 0}, height=500)
+    return fig
+
+
+def mapa_uf(cubo, filtros):
+    geojson = carregar_geojson_uf()
+    if geojson is None:
+        return None
+    dados = proporcao_feminina(cubo, 'UF', filtros).rename(columns={'UF': 'SIGLA_UF'})
+    return figura_choropleth(dados, geojson, 'SIGLA_UF', 'SIGLA_UF')
+
+
+def mapa_municipios(cubo, filtros, estados):
+    feicoes = []
+    dados = []
+    for uf in estados:
+        geojson = carregar_geojson_municipios(uf)
+        if geojson is None:
+            continue
+        feicoes.extend(geojson['features'])
+        dados_uf = proporcao_feminina(cubo, 'Cidade', {**filtros, 'UF': [uf]})
+        dados_uf['CHAVE'] = [chave_municipio(uf, cidade) for cidade in dados_uf['Cidade']]
+        dados.append(dados_uf)
+    if not feicoes:
+        return None
+    geojson = {'type': 'FeatureCollection', 'features': feicoes}
+    return figura_choropleth(pd.concat(dados, ignore_index=True), geojson, 'CHAVE', 'Cidade')
+
+
+def exibir_mapa_genero(cubo, filtros):
+    # filtros no formato do cubo (inclui 'Cargo'); o filtro de gênero é ignorado no mapa
+    estados = filtros.get('UF') or []
+    with medir('mapa: construção'):
+        if estados:
+            fig = mapa_municipios(cubo, filtros, estados)
+            aviso = 'Geometria municipal não encontrada. Gere com: python geometria.py --nivel municipios'
+        else:
+            fig = mapa_uf(cubo, filtros)
+            aviso = 'Geometria do mapa não encontrada. Gere com: python geometria.py'
+
+    if fig is None:
+        st.info(aviso)
+    else:
+        with medir('mapa: envio'):
+            st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,250 @@
+# Instrumentação das etapas de renderização
+# medir('etapa') marca o tempo de um trecho e o pico de memória do processo ao fim dele.
+# As medições de cada execução de página vão para o painel de depuração da barra lateral
+# (com ?debug=1 na URL ou DASH_DEBUG=1) e para um log JSONL; os tempos de todas as
+# sessões são agregados em histogramas no formato texto do Prometheus, regravados a cada
+# execução. Log e histogramas ficam em um arquivo por worker, numerado pela vaga que o
+# processo prende (flock) na pasta ao gravar pela primeira vez (no nome e, nas métricas,
+# o rótulo worker): vários workers não sobrescrevem nem rotacionam os arquivos uns dos
+# outros, e um worker reiniciado reaproveita a vaga livre, sem criar séries novas. O
+# coletor textfile do node_exporter junta os .prom da pasta; o .prom de um worker é
+# apagado quando ele sai, e os de vagas abandonadas (processo morto) na partida do próximo.
+# Componentes com estado próprio (ex.: caches) registram suas estatísticas, que entram
+# no painel e no arquivo do Prometheus como medidores.
+# DASH_METRICAS=0 desliga a gravação dos arquivos; as medições continuam em memória.
+
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+try:
+    import fcntl
+    import resource
+except ImportError:  # Windows
+    fcntl = resource = None
+
+PASTA_METRICAS = os.environ.get('DASH_METRICAS_PASTA', 'metricas')
+GRAVAR_ARQUIVOS = os.environ.get('DASH_METRICAS', '1') != '0'
+DEBUG = os.environ.get('DASH_DEBUG', '0') == '1'
+
+# O log é renomeado para .1 ao passar deste tamanho
+TAMANHO_MAXIMO_LOG = 50 * 1024 * 1024
+
+# Limites superiores dos baldes dos histogramas, em segundos
+BALDES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+
+_local = threading.local()
+_trava = threading.Lock()
+_histogramas = {}
+_estatisticas = {}
+_trava_vaga = threading.Lock()
+_vaga = None  # (pid, número, arquivo da trava)
+
+
+def arquivo_trava(numero):
+    return os.path.join(PASTA_METRICAS, f'worker_{numero}.lock')
+
+
+def arquivo_log(numero=None):
+    return os.path.join(PASTA_METRICAS, f'execucoes_{vaga_worker() if numero is None else numero}.jsonl')
+
+
+def arquivo_prometheus(numero=None):
+    return os.path.join(PASTA_METRICAS, f'dashboard_{vaga_worker() if numero is None else numero}.prom')
+
+
+def prender_vaga(numero):
+    # Arquivo da trava aberto, ou None se outro processo vivo tem a vaga
+    trava = open(arquivo_trava(numero), 'a')
+    try:
+        fcntl.flock(trava, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        trava.close()
+        return None
+    return trava
+
+
+def limpar_vagas_abandonadas(propria):
+    # .prom de workers que morreram sem passar pelo atexit (a trava se solta com o processo)
+    for caminho in glob.glob(os.path.join(PASTA_METRICAS, 'dashboard_*.prom')):
+        numero = os.path.basename(caminho)[len('dashboard_'):-len('.prom')]
+        if numero == str(propria):
+            continue
+        if not os.path.exists(arquivo_trava(numero)):
+            os.remove(caminho)
+            continue
+        trava = prender_vaga(numero)
+        if trava is not None:
+            with trava:
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+
+
+def remover_prometheus(pid, numero):
+    # No atexit: o coletor não deve seguir exportando os últimos valores de quem saiu
+    if os.getpid() == pid and os.path.exists(arquivo_prometheus(numero)):
+        os.remove(arquivo_prometheus(numero))
+
+
+def vaga_worker():
+    # Menor vaga livre na pasta, presa enquanto o processo vive. Conferida pelo PID:
+    # um processo filho (fork) herda a trava do pai, mas precisa da própria vaga
+    global _vaga
+    with _trava_vaga:
+        if _vaga is not None and _vaga[0] == os.getpid():
+            return _vaga[1]
+        if _vaga is not None:
+            _vaga[2].close()
+        if fcntl is None:
+            # Sem flock (Windows) a vaga é o PID; o atexit ainda apaga o .prom
+            numero, trava = os.getpid(), None
+        else:
+            os.makedirs(PASTA_METRICAS, exist_ok=True)
+            numero = 0
+            while (trava := prender_vaga(numero)) is None:
+                numero += 1
+            limpar_vagas_abandonadas(numero)
+        _vaga = (os.getpid(), numero, trava)
+        atexit.register(remover_prometheus, os.getpid(), numero)
+        return numero
+
+
+def memoria_pico():
+    # Pico de memória residente do processo, em bytes (ru_maxrss vem em KB no Linux)
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def registrar_estatisticas(nome, obter):
+    # obter() retorna {medida: número}; é chamado a cada painel e gravação
+    _estatisticas[nome] = obter
+
+
+def estatisticas():
+    return {nome: obter() for nome, obter in list(_estatisticas.items())}
+
+
+def _observar(etapa, segundos):
+    with _trava:
+        histograma = _histogramas.setdefault(etapa, {'baldes': [0] * len(BALDES), 'soma': 0.0, 'n': 0})
+        for i, limite in enumerate(BALDES):
+            if segundos <= limite:
+                histograma['baldes'][i] += 1
+        histograma['soma'] += segundos
+        histograma['n'] += 1
+
+
+@contextmanager
+def medir(etapa):
+    # Fora de uma execução de página (ex.: aquecimento) só entra nos histogramas
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        segundos = time.perf_counter() - inicio
+        _observar(etapa, segundos)
+        execucao = getattr(_local, 'execucao', None)
+        if execucao is not None:
+            execucao['etapas'].append({'etapa': etapa, 'ms': segundos * 1000, 'memoria_pico': memoria_pico()})
+
+
+def resumo_etapas(etapas):
+    # Chamadas, tempo total e pico de memória por etapa (etapas repetidas são somadas)
+    if not etapas:
+        return pd.DataFrame(columns=['Etapa', 'Chamadas', 'Tempo (ms)', 'Pico de memória (MB)'])
+    df = pd.DataFrame(etapas)
+    resumo = df.groupby('etapa', sort=False).agg(
+        Chamadas=('ms', 'size'), tempo=('ms', 'sum'), pico=('memoria_pico', 'max'),
+    )
+    resumo['pico'] = resumo['pico'] / 2**20
+    resumo = resumo.rename(columns={'tempo': 'Tempo (ms)', 'pico': 'Pico de memória (MB)'})
+    return resumo.rename_axis('Etapa').reset_index().round(1)
+
+
+def gravar_log(execucao):
+    os.makedirs(PASTA_METRICAS, exist_ok=True)
+    caminho = arquivo_log()
+    if os.path.exists(caminho) and os.path.getsize(caminho) > TAMANHO_MAXIMO_LOG:
+        os.replace(caminho, caminho + '.1')
+    with open(caminho, 'a', encoding='utf-8') as arquivo:
+        arquivo.write(json.dumps(execucao, ensure_ascii=False) + '\n')
+
+
+def texto_prometheus():
+    worker = f'worker="{vaga_worker()}"'
+    linhas = [
+        '# HELP dashboard_etapa_segundos Tempo das etapas de renderização das páginas.',
+        '# TYPE dashboard_etapa_segundos histogram',
+    ]
+    with _trava:
+        histogramas = {etapa: dict(h, baldes=list(h['baldes'])) for etapa, h in _histogramas.items()}
+    for etapa, histograma in sorted(histogramas.items()):
+        rotulo = etapa.replace('\\', '\\\\').replace('"', '\\"')
+        for limite, contagem in zip(BALDES, histograma['baldes']):
+            le = '+Inf' if limite == float('inf') else f'{limite:g}'
+            linhas.append(f'dashboard_etapa_segundos_bucket{{{worker},etapa="{rotulo}",le="{le}"}} {contagem}')
+        linhas.append(f'dashboard_etapa_segundos_sum{{{worker},etapa="{rotulo}"}} {histograma["soma"]:.6f}')
+        linhas.append(f'dashboard_etapa_segundos_count{{{worker},etapa="{rotulo}"}} {histograma["n"]}')
+    linhas += [
+        '# HELP dashboard_memoria_pico_bytes Pico de memória residente do processo.',
+        '# TYPE dashboard_memoria_pico_bytes gauge',
+        f'dashboard_memoria_pico_bytes{{{worker}}} {memoria_pico()}',
+    ]
+    for nome, medidas in estatisticas().items():
+        for medida, valor in medidas.items():
+            linhas.append(f'# TYPE dashboard_{nome}_{medida} gauge')
+            linhas.append(f'dashboard_{nome}_{medida}{{{worker}}} {valor}')
+    return '\n'.join(linhas) + '\n'
+
+
+def gravar_prometheus():
+    # Gravação atômica: o coletor nunca lê um arquivo pela metade
+    os.makedirs(PASTA_METRICAS, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=PASTA_METRICAS, suffix='.tmp')
+    with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(texto_prometheus())
+    os.replace(temporario, arquivo_prometheus())
+
+
+def exibir_painel(painel, execucao):
+    with painel.container():
+        with st.expander('Depuração: tempos desta execução', expanded=True):
+            st.metric('Execução', f"{execucao['ms']:.0f} ms")
+            st.metric('Pico de memória do processo', f"{execucao['memoria_pico'] / 2**20:.0f} MB")
+            st.dataframe(resumo_etapas(execucao['etapas']), hide_index=True)
+            for nome, medidas in estatisticas().items():
+                st.caption(nome)
+                st.json(medidas, expanded=False)
+
+
+@contextmanager
+def registrar_execucao(pagina):
+    # Envolve a execução de uma página: coleta as etapas, grava os arquivos e, em modo
+    # de depuração, preenche o painel da barra lateral (reservado antes da página rodar)
+    depuracao = DEBUG or st.query_params.get('debug') == '1'
+    painel = st.sidebar.empty() if depuracao else None
+    execucao = {'pagina': pagina, 'inicio': time.time(), 'etapas': []}
+    _local.execucao = execucao
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.execucao = None
+        execucao['ms'] = (time.perf_counter() - inicio) * 1000
+        execucao['memoria_pico'] = memoria_pico()
+        _observar(f'página {pagina}', execucao['ms'] / 1000)
+        if GRAVAR_ARQUIVOS:
+            with _trava:
+                gravar_log(execucao)
+            gravar_prometheus()
+        if painel is not None:
+            exibir_painel(painel, execucao)
@@ -0,0 +1,372 @@
+# Página de candidaturas de um cargo (prefeitos, vice-prefeitos, vereadores)
+# As páginas em paginas/ só escolhem o cargo; os textos, gráficos, filtros e tabelas saem
+# daqui. A base é gravada ordenada por cargo (e UF, ver base_candidatos), então cada cargo
+# é uma faixa contígua de linhas, e base, índice, cubo e motores são carregados uma vez
+# por processo para todos os cargos: trocar de página não lê a base de novo, e um cargo
+# novo é só uma entrada em PAGINAS_CARGO (e em agregar_bens.CARGOS, para os agregados).
+
+import os
+from functools import partial
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from agregar_bens import CARGOS, arquivo_agregado
+from base_candidatos import ano_selecionado
+from busca_nomes import exibir_busca
+from cache_figuras import figuras_em_cache
+from cache_resultados import resultado_filtros
+from comparacao_anos import exibir_comparacao_anos
+from cubo_contagens import carregar_cubo
+from distribuicao_bens import exibir_distribuicao_bens
+from facetas import exibir_filtros
+from mapas import exibir_mapa_genero
+from metricas import medir
+from percentis_bens import carregar_motor_percentis
+from ranking_bens import exibir_ranking
+from tabela_paginada import exibir_tabela
+
+# Textos (singular_cor: o cargo nos títulos dos gráficos por cor), altura da tabela e as
+# diferenças de apresentação de cada cargo: formato de média e mediana nos hovers
+# ('reais' ou 'unidades'), fonte do título do gráfico de candidaturas por cor, colunas
+# no hover de bens por cor, se há o gráfico de total por raça e gênero e se o autor fica
+# na barra lateral
+PAGINAS_CARGO = {
+    'PREFEITO': {
+        'plural': 'Prefeituras', 'singular': 'Prefeito', 'singular_cor': 'Prefeitura', 'altura_tabela': 300,
+        'formato': 'reais', 'fonte_titulo_cor': 12, 'hover_bens_cor': ['Media', 'Mediana'],
+        'total_cor_genero': False, 'autor_na_barra_lateral': True,
+    },
+    'VICE-PREFEITO': {
+        'plural': 'Vice-Prefeituras', 'singular': 'Vice-Prefeito', 'singular_cor': 'Vice-Prefeitura', 'altura_tabela': 300,
+        'formato': 'reais', 'fonte_titulo_cor': 12, 'hover_bens_cor': ['Media', 'Mediana'],
+        'total_cor_genero': False, 'autor_na_barra_lateral': True,
+    },
+    'VEREADOR': {
+        'plural': 'Vereadores', 'singular': 'Vereador', 'singular_cor': 'Vereador', 'altura_tabela': 600,
+        'formato': 'unidades', 'fonte_titulo_cor': 15, 'hover_bens_cor': ['Media'],
+        'total_cor_genero': True, 'autor_na_barra_lateral': False,
+    },
+}
+
+# Layout comum dos gráficos dos agregados
+TITULO = {'x': 0.5, 'xanchor': 'center', 'yanchor': 'top', 'font': dict(size=15)}
+LEGENDA = dict(x=1, xanchor='center', y=0.5, yanchor='middle')
+FUNDO = dict(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+
+
+def formatar_reais(value):
+    return f'R${value:,.2f}'
+
+
+# Função para formatar os valores com unidades
+def formatar_unidades(value):
+    if value >= 1e9:
+        return f'{value / 1e9:.2f} Bilhão'
+    elif value >= 1e6:
+        return f'{value / 1e6:.2f} Milhão'
+    elif value >= 1e3:
+        return f'{value / 1e3:.2f} Mil'
+    else:
+        return f'{value:.2f}'
+
+
+FORMATOS_VALOR = {'reais': formatar_reais, 'unidades': formatar_unidades}
+
+
+def construir_graficos_cor(caminho, pagina, ano):
+    singular = pagina['singular_cor']
+    format_value = FORMATOS_VALOR[pagina['formato']]
+
+    # Carregando a base de dados de cor do cargo
+    cor = pd.read_csv(caminho)
+    cor.columns = ['Cor', 'Candidatos', 'Total', 'Media', 'Mediana']
+
+    # Criando o percentual de candidatos
+    cor['Percentual'] = ((cor['Candidatos'] / cor['Candidatos'].sum() * 100).round(2)).astype(str) + '%'
+
+    # Criando gráfico interativo com plotly de contagem de candidaturas por cor
+    fig_cor = px.bar(
+        cor,
+        x='Cor',
+        y='Candidatos',
+        labels={'Candidatos': 'Número de Candidatos', 'Cor': 'Cor'},
+        color='Cor',
+        color_discrete_sequence=px.colors.qualitative.Set3,
+        hover_data={'Percentual': True}  # Adicionando a coluna Percentual ao hover data
+    )
+    fig_cor.update_layout(
+        title={
+            'text': f'Candidaturas a {singular} por Cor nas Cidades Brasileiras em {ano}',
+            **TITULO, 'font': dict(size=pagina['fonte_titulo_cor']),
+        },
+        height=500, legend=LEGENDA, **FUNDO,
+    )
+
+    # Aplicando a formatação aos dados
+    cor['Media'] = cor['Media'].apply(format_value)
+    cor['Mediana'] = cor['Mediana'].apply(format_value)
+
+    # Criando gráfico interativo com plotly de total de bens por cor
+    fig_bens_cor = px.bar(
+        cor,
+        x='Cor',
+        y='Total',
+        labels={'Total': 'Total de Bens', 'Cor': 'Cor'},
+        color='Cor',
+        color_discrete_sequence=px.colors.qualitative.Set3,
+        hover_data=dict.fromkeys(pagina['hover_bens_cor'], True),  # Usando os dados formatados
+    )
+
+    # Removendo o texto das barras
+    fig_bens_cor.update_traces(texttemplate='')
+    fig_bens_cor.update_layout(
+        title={
+            'text': f'Bens declarados em (R$) de candidatos a {singular} por Cor nas Cidades Brasileiras em {ano}',
+            **TITULO, 'font': dict(size=12),
+        },
+        height=500, legend=LEGENDA, **FUNDO,
+    )
+    return fig_cor, fig_bens_cor
+
+
+def construir_graficos_cor_genero(caminho, pagina, ano):
+    singular = pagina['singular']
+    format_value = FORMATOS_VALOR[pagina['formato']]
+
+    # Carregando a base de dados de cor e gênero do cargo
+    genero_cor = pd.read_csv(caminho)
+    genero_cor.columns = ['Cor', 'Genero', 'Candidatos', 'Total', 'Media', 'Mediana']
+
+    figuras = []
+    if pagina['total_cor_genero']:
+        # Criando gráfico interativo com plotly de total de candidaturas por raça e gênero
+        fig_genero_cor = px.bar(
+            genero_cor,
+            x='Cor',
+            y='Candidatos',
+            labels={'Candidatos': 'Número de Candidatos', 'Cor': 'Cor'},
+            color='Genero',
+            color_discrete_sequence=px.colors.qualitative.Set3,
+            barmode='group'  # Configurando para barras agrupadas
+        )
+        fig_genero_cor.update_layout(
+            title={'text': f'Total de Candidaturas por Raça e Gênero nas Eleições de {ano}', **TITULO},
+            legend=LEGENDA, height=500, **FUNDO,
+        )
+        figuras.append(fig_genero_cor)
+
+    # Formatando os valores de média e mediana para exibição
+    genero_cor['Media_format'] = genero_cor['Media'].apply(format_value)
+    genero_cor['Mediana_format'] = genero_cor['Mediana'].apply(format_value)
+
+    # Criando gráfico interativo com plotly de mediana dos bens por cor e gênero
+    fig_bens_cor_genero = px.bar(
+        genero_cor,
+        x='Cor',
+        y='Mediana',
+        labels={'Total': 'Total de Bens', 'Cor': 'Cor'},
+        color='Genero',
+        color_discrete_sequence=px.colors.qualitative.Set3,
+        hover_data={'Media_format': True, 'Mediana_format': True},
+        barmode='group'
+    )
+
+    # Removendo o texto das barras
+    fig_bens_cor_genero.update_traces(texttemplate='')
+    fig_bens_cor_genero.update_layout(
+        title={'text': f'Mediana dos Bens Declarados por Cor e Gênero dos Candidatos a {singular} nas Eleições de {ano}', **TITULO},
+        legend=LEGENDA, height=500, **FUNDO,
+        margin={"r": 10, "t": 10, "l": 10, "b": 10}
+    )
+
+    # Atualizando os dados exibidos no hover
+    fig_bens_cor_genero.update_traces(
+        hovertemplate='Total de Bens: %{y:.2f}<br>Média: %{customdata[0]}<br>Mediana: %{customdata[1]}'
+    )
+    figuras.append(fig_bens_cor_genero)
+    return figuras
+
+
+def exibir_cabecalho(pagina, ano):
+    # Título da página
+    st.title(f"Dados sobre Candidaturas a {pagina['plural']} nas Eleições de {ano}")
+
+    st.markdown(f"""
+### Análise dos Dados Eleitorais de {ano}
+
+Esta análise foi realizada utilizando dados do TSE de {ano}{' (coletados em 21 de agosto de 2024)' if ano == 2024 else ''}.
+O tratamento e a disposição dos dados foram feitos utilizando Python, Streamlit e outras bibliotecas de visualização e tratamento de dados.
+""")
+
+    if not pagina['autor_na_barra_lateral']:
+        st.markdown("""
+#### Autor
+Christian Basilio, Gestor Público pela UFRJ e Pós-Graduando em Comunicação Política e Sociedade na ESPM.
+""")
+        return
+
+    st.sidebar.markdown("""
+## Autor
+Christian Basilio, da Baixada Fluminense-RJ, Gestor Público pela UFRJ e Pós-Graduando em Comunicação Política e Sociedade na ESPM.
+### Contato
+- Email: [Christianbasilio97@gmail.com](mailto:Christianbasilio97@gmail.com)
+- LinkedIn: [linkedin.com/in/christianbasilio](https://www.linkedin.com/in/christianbasilioo/)
+""")
+
+
+def exibir_graficos_agregados(cargo, pagina, ano):
+    # Os gráficos abaixo dependem só dos CSVs estáticos de base_dashboard (os agregados do
+    # cargo no ano): são construídos uma vez por processo e só são refeitos quando o
+    # arquivo muda (cache_figuras)
+    prefixo = CARGOS[cargo]
+    arquivo_cor = arquivo_agregado(prefixo, 'cor', ano)
+    arquivo_cor_genero = arquivo_agregado(prefixo, 'cor_genero', ano)
+
+    # Subtítulo para a seção de candidaturas por cor
+    st.subheader(f"Candidaturas a {pagina['plural']} por Cor nas Eleições de {ano}")
+    if not os.path.exists(arquivo_cor):
+        st.info(f'Agregados de bens de {ano} não encontrados. Gere com: python agregar_bens.py --ano {ano}')
+        return
+
+    fig_cor, fig_bens_cor = figuras_em_cache(
+        f'{prefixo}_cor_{ano}', partial(construir_graficos_cor, arquivo_cor, pagina, ano), arquivo_cor
+    )
+
+    # Colocando os gráficos lado a lado
+    col1, col2 = st.columns(2)
+    with col1:
+        with medir('gráficos: envio'):
+            st.plotly_chart(fig_cor, use_container_width=True)
+    with col2:
+        with medir('gráficos: envio'):
+            st.plotly_chart(fig_bens_cor, use_container_width=True)
+
+    if os.path.exists(arquivo_cor_genero):
+        figuras = figuras_em_cache(
+            f'{prefixo}_cor_genero_{ano}',
+            partial(construir_graficos_cor_genero, arquivo_cor_genero, pagina, ano),
+            arquivo_cor_genero,
+        )
+        for figura in figuras:
+            with medir('gráficos: envio'):
+                st.plotly_chart(figura, use_container_width=True)
+
+
+def exibir_contagens(resultado):
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("##### Candidaturas por Cor:")
+        candidaturas_por_cor = resultado['contagens']['Cor']
+        with medir('gráficos: construção'):
+            fig_cor = px.pie(candidaturas_por_cor, names=candidaturas_por_cor.index, values=candidaturas_por_cor.values, labels={'names': 'Cor', 'values': 'Contagem'})
+        with medir('gráficos: envio'):
+            st.plotly_chart(fig_cor)
+
+    with col2:
+        st.markdown("##### Candidaturas por Partido:")
+        candidaturas_por_partido = resultado['contagens']['Partido']
+        with medir('gráficos: construção'):
+            fig_partido = px.bar(
+                candidaturas_por_partido,
+                x=candidaturas_por_partido.values,
+                y=candidaturas_por_partido.index,
+                orientation='h',
+                labels={'x': 'Contagem', 'y': 'Partido'},
+                color=candidaturas_por_partido.index,  # Adiciona cores diferentes para cada partido
+                color_discrete_sequence=px.colors.qualitative.Set3  # Escolhe uma paleta de cores
+            )
+            fig_partido.update_layout(
+                margin=dict(l=20, r=20, t=20, b=20),
+                height=800,  # Ajuste a altura conforme necessário
+                bargap=0.1,  # Ajuste o espaçamento entre as barras (0 a 1)
+                title="Candidaturas por Partido",
+                xaxis_title="Contagem",
+                yaxis_title="Partido"
+            )
+            fig_partido.update_traces(texttemplate='%{x}', textposition='outside')  # Adiciona rótulos nas barras
+        with medir('gráficos: envio'):
+            st.plotly_chart(fig_partido)
+
+    with col3:
+        st.markdown("##### Candidaturas por Gênero:")
+        candidaturas_por_genero = resultado['contagens']['Gênero']
+        with medir('gráficos: construção'):
+            fig_genero = px.pie(candidaturas_por_genero, names=candidaturas_por_genero.index, values=candidaturas_por_genero.values, labels={'names': 'Gênero', 'values': 'Contagem'})
+        with medir('gráficos: envio'):
+            st.plotly_chart(fig_genero)
+
+
+def exibir_bens(filtros_cubo, ano):
+    # Percentis dos bens declarados para a combinação de filtros atual
+    motor_percentis = carregar_motor_percentis(ano)
+    if motor_percentis is None:
+        return
+    percentis_bens, exato = motor_percentis.percentis(filtros_cubo)
+    if percentis_bens is None:
+        return
+    st.markdown("##### Bens Declarados por Candidato:")
+    col1, col2, col3 = st.columns(3)
+    col1.metric('Mediana', f"R${percentis_bens['p50']:,.2f}")
+    col2.metric('Percentil 90', f"R${percentis_bens['p90']:,.2f}")
+    col3.metric('Percentil 99', f"R${percentis_bens['p99']:,.2f}")
+    if not exato:
+        st.caption('Valores aproximados (erro relativo de até 1%).')
+
+    # Histograma e distribuição acumulada, somando as contagens por faixa dos grupos
+    exibir_distribuicao_bens(motor_percentis, filtros_cubo)
+
+
+def exibir_lista(cargo, pagina, ano):
+    # Subtítulo para a seção de lista de candidatos
+    st.subheader(f"Lista de Candidatos a {pagina['singular']} em {ano}")
+
+    # Filtros facetados por estado, cidade, partido e gênero: as opções e as contagens de cada
+    # uma saem do cubo de contagens (compartilhado entre sessões; as linhas da base não são tocadas)
+    cubo = carregar_cubo(ano)
+    filtros = exibir_filtros(cargo, ano)
+    filtros_cubo = {**filtros, 'Cargo': [cargo]}
+
+    # Resultado compartilhado entre sessões: a mesma combinação de filtros só é calculada uma vez;
+    # ao mudar um único multiselect, o resultado sai do anterior da sessão por diferença
+    resultado = resultado_filtros(filtros_cubo, chave_sessao=f'refino_{cargo}', ano=ano)
+
+    # Exibindo as contagens no Streamlit organizadamente
+    st.markdown(f"### Total de Candidaturas: {resultado['total']}")
+
+    # Sem candidaturas não há o que desenhar (os gráficos não aceitam séries vazias)
+    if resultado['total'] == 0:
+        st.write("Nenhum dado encontrado para os filtros selecionados.")
+        return
+
+    exibir_contagens(resultado)
+
+    # Mapa da proporção de candidaturas femininas: UFs no nível nacional e
+    # municípios quando há estado selecionado
+    st.markdown("##### % de Candidaturas Femininas:")
+    exibir_mapa_genero(cubo, filtros_cubo)
+
+    # Os mesmos filtros nas outras eleições disponíveis
+    exibir_comparacao_anos(filtros_cubo)
+
+    exibir_bens(filtros_cubo, ano)
+
+    # Candidatos com mais bens nos filtros atuais, com os bens de cada um
+    exibir_ranking(cargo, filtros_cubo, ano)
+
+    # Busca pelo nome (sem acentos, por prefixo ou parecido) dentro do resultado dos filtros
+    exibir_busca(cargo, resultado['ids'], ano)
+
+    # Tabela paginada no servidor: só a página visível é materializada e formatada
+    exibir_tabela(cargo, resultado['ids'], altura=pagina['altura_tabela'], ano=ano)
+
+
+def exibir_pagina_cargo(cargo):
+    pagina = PAGINAS_CARGO[cargo]
+    # Eleição escolhida na barra lateral
+    ano = ano_selecionado()
+    exibir_cabecalho(pagina, ano)
+    exibir_graficos_agregados(cargo, pagina, ano)
+    exibir_lista(cargo, pagina, ano)
@@ -0,0 +1,7 @@
+# Página de candidaturas a vice-prefeitos
+# Carregada só quando a página é visitada (ver dash_candidatosbr2.py); o conteúdo sai
+# do motor comum das páginas de cargo (pagina_cargo.py)
+
+from pagina_cargo import exibir_pagina_cargo
+
+exibir_pagina_cargo('VICE-PREFEITO')
@@ -0,0 +1,175 @@
+# Motor de percentis dos bens declarados
+# Mantém os totais de bens por candidato ordenados dentro de cada grupo fino
+# (cargo, UF, cidade, partido, gênero, cor) e, ao lado, um esboço em escala logarítmica
+# por grupo (contagens por faixa, que se somam entre grupos). Seleções pequenas são
+# respondidas de forma exata; seleções grandes somam os esboços, com erro relativo limitado.
+# Os histogramas de bens (barras logarítmicas, cada uma a união de faixas vizinhas do
+# esboço) saem sempre da soma dos esboços dos grupos filtrados, sem reler os valores dos
+# candidatos: as contagens de cada barra são exatas. Para cada combinação de cargo e UF
+# as barras já ficam somadas, e filtros só nesses campos somam poucas linhas prontas.
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from base_candidatos import carregar_candidatos
+from indice_filtros import IndiceFiltros
+from leitura_tse import ANO_ELEICAO
+from metricas import medir
+
+DIMENSOES_BENS = ['Cargo', 'UF', 'Cidade', 'Partido', 'Gênero', 'Cor']
+
+# Dimensões com os histogramas pré-somados
+DIMENSOES_HISTOGRAMA = ['Cargo', 'UF']
+
+# Erro relativo máximo dos percentis aproximados
+ERRO_RELATIVO = 0.01
+
+# Até quantos candidatos a resposta é calculada sobre os valores exatos
+LIMITE_EXATO = 20_000
+
+PERCENTIS = (50, 90, 99)
+
+# Barras do histograma por potência de 10 (aproximadamente: cada barra junta um número
+# inteiro de faixas do esboço)
+BINS_POR_DECADA = 10
+
+
+def gama_erro(erro_relativo=ERRO_RELATIVO):
+    return (1 + erro_relativo) / (1 - erro_relativo)
+
+
+def faixa_log(valores, gama):
+    # Faixa 0 guarda valores abaixo de R$ 1; a faixa i > 0 cobre (gama^(i-2), gama^(i-1)]
+    valores = np.asarray(valores, dtype=float)
+    faixas = np.zeros(len(valores), dtype=np.int32)
+    positivos = valores >= 1
+    faixas[positivos] = np.ceil(np.log(valores[positivos]) / np.log(gama)).astype(np.int32) + 1
+    return faixas
+
+
+def valor_faixa(faixas, gama):
+    # Valor representativo da faixa (erro relativo de no máximo (gama - 1) / (gama + 1))
+    faixas = np.asarray(faixas)
+    return np.where(faixas > 0, 2 * gama ** (faixas - 1.0) / (gama + 1), 0.0)
+
+
+def faixas_por_barra(gama, bins_por_decada=BINS_POR_DECADA):
+    return max(1, round(np.log(10) / bins_por_decada / np.log(gama)))
+
+
+def barra_faixa(faixas, por_barra):
+    # Barra do histograma de cada faixa do esboço: 0 para valores abaixo de R$ 1; a barra
+    # b > 0 junta as faixas (b - 1) * por_barra + 1 a b * por_barra
+    faixas = np.asarray(faixas, dtype=np.int64)
+    return np.where(faixas > 0, (faixas - 1) // por_barra + 1, 0)
+
+
+def posicoes_fatias(inicios, ids):
+    # Concatena, sem laço em Python, as posições [inicios[i], inicios[i + 1]) dos ids
+    comeco = inicios[ids]
+    tamanhos = inicios[ids + 1] - comeco
+    deslocamento = comeco - np.concatenate([[0], np.cumsum(tamanhos)[:-1]])
+    return np.arange(tamanhos.sum()) + np.repeat(deslocamento, tamanhos)
+
+
+class MotorPercentis:
+    def __init__(self, df, coluna='Total de Bens', dimensoes=DIMENSOES_BENS,
+                 erro_relativo=ERRO_RELATIVO, limite_exato=LIMITE_EXATO,
+                 dimensoes_histograma=DIMENSOES_HISTOGRAMA):
+        df = df[df[coluna].notna()]
+        agrupado = df.groupby(dimensoes, observed=True, dropna=False)
+        grupo = agrupado.ngroup().to_numpy()
+        grupos = agrupado.size().reset_index(name='Candidatos')
+
+        self.gama = gama_erro(erro_relativo)
+        self.limite_exato = limite_exato
+        self.indice = IndiceFiltros(grupos, campos=dimensoes)
+        self.tamanhos = grupos['Candidatos'].to_numpy(dtype=np.int64)
+        self.inicios = np.concatenate([[0], np.cumsum(self.tamanhos)])
+
+        # Valores ordenados por grupo e, dentro do grupo, por valor
+        valores = df[coluna].to_numpy(dtype=float)
+        ordem = np.lexsort((valores, grupo))
+        self.valores = valores[ordem]
+        grupo = grupo[ordem]
+
+        # Esboço: pares (grupo, faixa) distintos com suas contagens, na mesma ordem
+        faixas = faixa_log(self.valores, self.gama)
+        muda = np.ones(len(faixas), dtype=bool)
+        muda[1:] = (grupo[1:] != grupo[:-1]) | (faixas[1:] != faixas[:-1])
+        posicoes = np.flatnonzero(muda)
+        self.esboco_faixas = faixas[posicoes]
+        self.esboco_contagens = np.diff(np.append(posicoes, len(faixas)))
+        self.esboco_inicios = np.searchsorted(grupo[posicoes], np.arange(len(self.tamanhos) + 1))
+        self.por_barra = faixas_por_barra(self.gama)
+        self.esboco_barras = barra_faixa(self.esboco_faixas, self.por_barra)
+
+        # Barras somadas por combinação das dimensões do histograma (uma linha cada)
+        combinacoes = grupos.groupby(dimensoes_histograma, observed=True, dropna=False)
+        combinacao = combinacoes.ngroup().to_numpy()[np.repeat(np.arange(len(self.tamanhos)), np.diff(self.esboco_inicios))]
+        n_combinacoes, n_barras = combinacoes.ngroups, int(self.esboco_barras.max(initial=0)) + 1
+        self.indice_histograma = IndiceFiltros(combinacoes.size().reset_index(), campos=dimensoes_histograma)
+        self.barras_combinacao = np.bincount(
+            combinacao * n_barras + self.esboco_barras, weights=self.esboco_contagens,
+            minlength=n_combinacoes * n_barras,
+        ).reshape(n_combinacoes, n_barras)
+
+    def percentis(self, filtros, percentis=PERCENTIS):
+        # Retorna (Series de percentis, exato) ou (None, True) se não há candidatos
+        with medir('percentis'):
+            return self._percentis(filtros, percentis)
+
+    def grupos(self, filtros):
+        ids = self.indice.filtrar(filtros)
+        return np.arange(len(self.tamanhos)) if ids is None else ids
+
+    def somar_esbocos(self, ids, faixas):
+        # Contagens por faixa (do esboço ou barra do histograma) dos grupos dados
+        posicoes = posicoes_fatias(self.esboco_inicios, ids)
+        return np.bincount(faixas[posicoes], weights=self.esboco_contagens[posicoes])
+
+    def _percentis(self, filtros, percentis):
+        ids = self.grupos(filtros)
+        n = int(self.tamanhos[ids].sum())
+        if n == 0:
+            return None, True
+
+        indice = pd.Index([f'p{p}' for p in percentis], name='Percentil')
+        if n <= self.limite_exato:
+            valores = self.valores[posicoes_fatias(self.inicios, ids)]
+            return pd.Series(np.percentile(valores, percentis), index=indice), True
+
+        # Soma os esboços dos grupos e procura a faixa de cada posição
+        acumulado = np.cumsum(self.somar_esbocos(ids, self.esboco_faixas))
+        alvo = np.asarray(percentis) / 100 * (n - 1)
+        faixas = np.searchsorted(acumulado, alvo, side='right')
+        return pd.Series(valor_faixa(faixas, self.gama), index=indice), False
+
+    def histograma(self, filtros):
+        # DataFrame das barras com candidatos: valores em (Mínimo, Máximo] e contagem; a
+        # primeira barra (Mínimo 0) é a dos valores abaixo de R$ 1. None se não há candidatos
+        with medir('histograma de bens'):
+            ativos = {campo: valores for campo, valores in filtros.items() if valores}
+            if all(campo in self.indice_histograma.codigos for campo in ativos):
+                ids = self.indice_histograma.filtrar(ativos)
+                contagens = self.barras_combinacao.sum(axis=0) if ids is None else self.barras_combinacao[ids].sum(axis=0)
+            else:
+                contagens = self.somar_esbocos(self.grupos(filtros), self.esboco_barras)
+            barras = np.flatnonzero(contagens)
+            if len(barras) == 0:
+                return None
+            return pd.DataFrame({
+                'Mínimo': np.where(barras > 0, self.gama ** ((barras - 1) * self.por_barra - 1.0), 0.0),
+                'Máximo': np.where(barras > 0, self.gama ** (barras * self.por_barra - 1.0), 1.0),
+                'Candidatos': contagens[barras].astype(np.int64),
+            })
+
+
+@st.cache_resource
+def carregar_motor_percentis(ano=ANO_ELEICAO):
+    # Sem os bens juntados na base de candidatos o motor fica indisponível e a seção é omitida
+    base = carregar_candidatos(ano)
+    if 'Total de Bens' not in base.columns:
+        return None
+    return MotorPercentis(base.colunas_pandas(DIMENSOES_BENS + ['Total de Bens']))
@@ -0,0 +1,206 @@
+# Ranking dos candidatos com mais bens declarados
+# Os totais de bens por candidato são ordenados (do maior para o menor) uma vez por
+# processo: na ordem global e dentro de cada partição (cargo, UF, partido, gênero).
+# O top-k de uma combinação de filtros sai da intercalação (k-way merge, com heap) das
+# partições que passam nos filtros, lendo só o começo de cada uma, em vez de ordenar
+# todas as linhas filtradas a cada execução. Com cidade selecionada as linhas são poucas
+# e saem direto do índice de filtros.
+# Cada candidato do ranking pode ser detalhado nos bens declarados item a item.
+# Se a base de candidatos de 2024 foi gerada sem os bens, o ranking usa o
+# base_dashboard/top_prefeitos.csv (bens de candidatos a prefeito, sem gênero).
+
+import heapq
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from base_candidatos import VALOR_AUSENTE, carregar_candidatos
+from indice_filtros import CAMPOS_FILTRO, IndiceFiltros, carregar_indice
+from leitura_tse import ANO_ELEICAO, CHAVE_CANDIDATO
+from metricas import medir
+from tabela_paginada import formatar_reais
+
+ARQUIVO_TOP_PREFEITOS = 'base_dashboard/top_prefeitos.csv'
+
+# Campos que definem as partições pré-ordenadas
+PARTICOES_RANKING = ['Cargo', 'UF', 'Partido', 'Gênero']
+
+# Colunas exibidas no ranking
+COLUNAS_RANKING = ['Nome', 'Cidade', 'UF', 'Partido', 'Total de Bens']
+
+TAMANHOS_RANKING = [10, 20, 50]
+
+# Versão do formato da ordem dos bens gravada com a base (sobe quando ele muda)
+VERSAO_ORDEM = 1
+
+
+def ordem_decrescente(valores, linhas):
+    # Linhas do maior para o menor valor; empates na ordem das linhas
+    return linhas[np.lexsort((linhas, -valores[linhas]))]
+
+
+class IndiceRanking:
+    def __init__(self, indice, valores, particoes=PARTICOES_RANKING):
+        # indice: IndiceFiltros das linhas; valores: total de bens de cada linha
+        # (linhas sem valor ficam fora do ranking)
+        self.indice = indice
+        self.valores = np.asarray(valores, dtype=float)
+        self.particoes = particoes
+        self.ordem_global = ordem_decrescente(self.valores, np.flatnonzero(~np.isnan(self.valores)))
+
+        # Partição de cada linha pela combinação dos códigos; a ordenação estável mantém
+        # cada partição do maior para o menor valor
+        dimensoes = [len(indice.categorias[campo]) + 1 for campo in particoes]
+        chave = np.ravel_multi_index(
+            [np.asarray(indice.codigos[campo])[self.ordem_global] for campo in particoes], dimensoes
+        )
+        ordem = np.argsort(chave, kind='stable')
+        self.linhas = self.ordem_global[ordem]
+        chaves, inicios = np.unique(chave[ordem], return_index=True)
+        self.inicios = np.append(inicios, len(ordem))
+        self.codigos_particao = dict(zip(particoes, np.unravel_index(chaves, dimensoes)))
+
+    def top(self, filtros, k):
+        # Linhas das k maiores fortunas que passam nos filtros, da maior para a menor
+        ativos = {campo: valores for campo, valores in filtros.items() if valores}
+        with medir('ranking de bens'):
+            if not ativos:
+                return self.ordem_global[:k]
+
+            if any(campo not in self.particoes for campo in ativos):
+                # Filtro fora das partições (cidade): poucas linhas, ordenadas direto
+                ids = self.indice.filtrar(ativos)
+                ids = ids[~np.isnan(self.valores[ids])]
+                return ordem_decrescente(self.valores, ids)[:k]
+
+            selecionadas = np.ones(len(self.inicios) - 1, dtype=bool)
+            for campo, valores in ativos.items():
+                selecionadas &= self.indice.mascara_valores(campo, valores)[self.codigos_particao[campo]]
+            return self.intercalar(np.flatnonzero(selecionadas), k)
+
+    def intercalar(self, particoes, k):
+        # k-way merge das partições. Só as k partições com os maiores primeiros valores
+        # podem entrar no top-k, então o heap começa só com elas
+        inicios, fins = self.inicios[particoes], self.inicios[particoes + 1]
+        primeiras = self.linhas[inicios]
+        melhores = np.lexsort((primeiras, -self.valores[primeiras]))[:k]
+        heap = [
+            (-self.valores[linha], linha, posicao, fim)
+            for linha, posicao, fim in zip(
+                primeiras[melhores].tolist(), inicios[melhores].tolist(), fins[melhores].tolist()
+            )
+        ]
+        heapq.heapify(heap)
+
+        resultado = []
+        while heap and len(resultado) < k:
+            _, linha, posicao, fim = heapq.heappop(heap)
+            resultado.append(linha)
+            if posicao + 1 < fim:
+                proxima = int(self.linhas[posicao + 1])
+                heapq.heappush(heap, (-self.valores[proxima], proxima, posicao + 1, fim))
+        return np.asarray(resultado, dtype=np.int64)
+
+
+def ordem_itens(tabela):
+    chaves = tabela.column(CHAVE_CANDIDATO).to_numpy()
+    ordem = np.argsort(chaves, kind='stable')
+    return {'ordem': ordem, 'chaves': chaves[ordem]}
+
+
+class ItensBens:
+    # Bens item a item da base (bens.arrow), localizados pela chave do candidato
+    def __init__(self, base):
+        self.tabela = base.itens_bens()
+        arrays = base.derivado('ordem bens', lambda: ordem_itens(self.tabela), VERSAO_ORDEM)
+        self.ordem = arrays['ordem']
+        self.chaves = arrays['chaves']
+
+    def do_candidato(self, chave):
+        inicio = np.searchsorted(self.chaves, chave, side='left')
+        fim = np.searchsorted(self.chaves, chave, side='right')
+        itens = self.tabela.take(pa.array(self.ordem[inicio:fim])).to_pandas()
+        return itens.drop(columns=CHAVE_CANDIDATO).sort_values('Valor', ascending=False)
+
+
+class RankingBens:
+    # Índice do ranking e, da fonte dos dados, as linhas exibidas e os bens de cada uma
+    def __init__(self, indice, valores, candidatos, itens=None):
+        self.indice = IndiceRanking(indice, valores)
+        self.candidatos = candidatos  # ids -> DataFrame com COLUNAS_RANKING
+        self.itens = itens  # id -> DataFrame dos bens declarados
+
+
+def ranking_base(base, indice):
+    chaves = base.valores(CHAVE_CANDIDATO)
+    itens = ItensBens(base) if base.itens_bens() is not None else None
+    return RankingBens(
+        indice,
+        base.valores('Total de Bens'),
+        candidatos=lambda ids: base.linhas(ids, COLUNAS_RANKING),
+        itens=(lambda linha: itens.do_candidato(chaves[linha])) if itens is not None else None,
+    )
+
+
+def ranking_top_prefeitos(caminho=ARQUIVO_TOP_PREFEITOS):
+    # O arquivo não tem a chave do candidato: os bens são agrupados por nome, UF, cidade
+    # e partido. O gênero não vem no arquivo e fica como ausente.
+    bens = pd.read_csv(caminho).rename(columns={
+        'NM_CANDIDATO': 'Nome', 'SG_UF_y': 'UF', 'NM_UE_y': 'Cidade', 'SG_PARTIDO': 'Partido',
+        'VR_BEM_CANDIDATO': 'Valor',
+    })
+    agrupado = bens.groupby(['Nome', 'UF', 'Cidade', 'Partido'], sort=False)
+    candidato = agrupado.ngroup().to_numpy()
+    candidatos = agrupado['Valor'].sum().rename('Total de Bens').reset_index()
+    candidatos['Cargo'] = 'PREFEITO'
+    candidatos['Gênero'] = VALOR_AUSENTE
+    return RankingBens(
+        IndiceFiltros(candidatos, campos=CAMPOS_FILTRO),
+        candidatos['Total de Bens'].to_numpy(),
+        candidatos=lambda ids: candidatos.iloc[ids][COLUNAS_RANKING],
+        itens=lambda linha: bens.loc[candidato == linha, ['Valor']].sort_values('Valor', ascending=False),
+    )
+
+
+@st.cache_resource
+def carregar_ranking(ano=ANO_ELEICAO):
+    base = carregar_candidatos(ano)
+    if 'Total de Bens' in base.columns:
+        return ranking_base(base, carregar_indice(ano))
+    if ano == ANO_ELEICAO and os.path.exists(ARQUIVO_TOP_PREFEITOS):
+        return ranking_top_prefeitos()
+    return None
+
+
+def exibir_ranking(cargo, filtros, ano=ANO_ELEICAO):
+    # Top-k dos filtros atuais (formato do cubo, inclui 'Cargo') e detalhamento dos bens
+    ranking = carregar_ranking(ano)
+    if ranking is None:
+        return
+    st.markdown("##### Candidatos com Mais Bens Declarados:")
+    k = st.selectbox('Posições', TAMANHOS_RANKING, key=f'ranking_k_{cargo}')
+    linhas = ranking.indice.top(filtros, k)
+    if len(linhas) == 0:
+        st.caption('Nenhum candidato com bens declarados nos filtros atuais.')
+        return
+
+    tabela = ranking.candidatos(linhas).reset_index(drop=True)
+    tabela.index = pd.RangeIndex(1, len(tabela) + 1, name='Posição')
+    tabela['Total de Bens'] = formatar_reais(tabela['Total de Bens']).to_numpy()
+    st.dataframe(tabela)
+
+    if ranking.itens is None:
+        return
+    # As opções são as linhas da base: um filtro novo que tira o candidato limpa a escolha
+    rotulos = {linha: f"{posicao}º {nome}" for posicao, (linha, nome) in enumerate(zip(linhas.tolist(), tabela['Nome']), 1)}
+    escolhida = st.selectbox(
+        'Detalhar os bens de', list(rotulos), index=None, format_func=rotulos.get,
+        key=f'ranking_detalhe_{cargo}', placeholder='Escolha um candidato do ranking',
+    )
+    if escolhida is not None:
+        itens = ranking.itens(escolhida)
+        itens['Valor'] = formatar_reais(itens['Valor']).to_numpy()
+        st.dataframe(itens, hide_index=True)
@@ -0,0 +1,64 @@
+# Refinamento incremental dos filtros de uma sessão
+# Quando o usuário acrescenta ou tira valores de um único multiselect, o novo resultado
+# sai do anterior: como os valores de um campo têm listas de linhas disjuntas, basta
+# juntar (ou retirar) as linhas dos valores alterados que passam nos demais filtros, e
+# as contagens por dimensão são ajustadas só por essas linhas. O custo acompanha o
+# tamanho da mudança, não o da base.
+# Ligar ou desligar um campo (primeiro valor escolhido, último retirado) muda o conjunto
+# inteiro e cai no cálculo completo.
+
+import numpy as np
+
+from base_candidatos import carregar_candidatos
+from cubo_contagens import serie_contagens
+from indice_filtros import carregar_indice
+from leitura_tse import ANO_ELEICAO
+from metricas import medir
+
+
+def diferenca_filtros(anterior, atual):
+    # Retorna (campo, valores que entraram, valores que saíram) se só um campo mudou e
+    # continua ativo antes e depois; senão None
+    campos = set(anterior) | set(atual)
+    alterados = [c for c in campos if set(anterior.get(c) or ()) != set(atual.get(c) or ())]
+    if len(alterados) != 1:
+        return None
+    campo = alterados[0]
+    antes, depois = set(anterior.get(campo) or ()), set(atual.get(campo) or ())
+    if not antes or not depois:
+        return None
+    return campo, sorted(depois - antes), sorted(antes - depois)
+
+
+def refinar(anterior, filtros, resultado_anterior, ano=ANO_ELEICAO):
+    # anterior e filtros no formato do cubo; resultado_anterior como em resultado_filtros(),
+    # do mesmo ano
+    diferenca = diferenca_filtros(anterior, filtros)
+    ids = resultado_anterior['ids']
+    if diferenca is None or ids is None:
+        return None
+    campo, adicionados, removidos = diferenca
+
+    with medir('refino incremental'):
+        indice = carregar_indice(ano)
+        base = carregar_candidatos(ano)
+        outros = {c: v for c, v in filtros.items() if c != campo}
+        entram = indice.restringir(indice.linhas_do_campo(campo, adicionados), outros)
+        saem = indice.restringir(indice.linhas_do_campo(campo, removidos), outros)
+
+        # As linhas que saem estão todas no resultado anterior e as que entram, em nenhuma
+        novos = np.delete(ids, np.searchsorted(ids, saem))
+        novos = np.insert(novos, np.searchsorted(novos, entram), entram)
+
+        contagens = {}
+        for dimensao, serie in resultado_anterior['contagens'].items():
+            categorias = base.categorias(dimensao)
+            codigos = base.codigos(dimensao)
+            soma = (
+                serie.reindex(categorias, fill_value=0).to_numpy()
+                + np.bincount(codigos[entram], minlength=len(categorias))
+                - np.bincount(codigos[saem], minlength=len(categorias))
+            )
+            contagens[dimensao] = serie_contagens(soma, categorias, dimensao)
+
+    return {'ids': novos, 'total': len(novos), 'contagens': contagens}
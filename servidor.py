@@ -0,0 +1,30 @@
+# Servidor do dashboard com a base pré-carregada desde a partida
+# Com `streamlit run dash_candidatosbr2.py` o aquecimento só começa na primeira execução
+# de página (o Streamlit não tem gancho de partida do servidor), e o primeiro visitante
+# ainda espera parte da carga. Aqui o aquecimento é disparado no próprio processo do
+# servidor antes de o Streamlit subir: os caches (st.cache_resource) são do processo,
+# então as sessões já encontram a base, o índice e os cubos prontos.
+# Uso: python servidor.py [opções do streamlit run, ex.: --server.port 8501]
+
+# Importado primeiro: marca o início do processo para a medição da partida
+import desempenho  # noqa: F401
+
+import os
+import sys
+
+from streamlit.web import cli
+
+from aquecimento import iniciar_aquecimento
+
+ENTRADA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dash_candidatosbr2.py')
+
+
+def main():
+    # Thread de aquecimento do processo; a chamada no ponto de entrada vira nada
+    iniciar_aquecimento()
+    sys.argv = ['streamlit', 'run', ENTRADA, *sys.argv[1:]]
+    sys.exit(cli.main())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# Tabela de candidatos paginada no servidor
+# A ordenação e o recorte da página são feitos sobre os ids das linhas filtradas;
+# só a janela visível é formatada e enviada ao navegador.
+# Os postos de ordenação de cada coluna ficam gravados ao lado da base de candidatos
+# e são abertos por mapeamento de memória.
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from base_candidatos import COLUNAS_TABELA, FORMATO_TABELA, carregar_candidatos
+from exportacao import exibir_exportacao
+from leitura_tse import ANO_ELEICAO
+from metricas import medir
+
+TAMANHOS_PAGINA = [50, 100, 200, 500]
+
+# Versão do formato dos postos gravados com a base (sobe quando ele muda)
+VERSAO_POSTOS = 1
+
+
+def formatar_reais(valores):
+    # Formatação vetorizada no padrão 'R$ 1,234.56'; valores ausentes viram '-'
+    valores = pd.Series(valores, dtype=float)
+    centavos = (valores.abs() * 100).round().fillna(0).astype(np.int64)
+    inteiros = (centavos // 100).astype(str).str.replace(r'\B(?=(\d{3})+(?!\d))', ',', regex=True)
+    decimais = (centavos % 100).astype(str).str.zfill(2)
+    sinal = np.where(valores < 0, '-', '')
+    texto = 'R$ ' + sinal + inteiros + '.' + decimais
+    return texto.where(valores.notna(), '-')
+
+
+def postos_coluna(base, coluna):
+    # Posição de cada linha na ordenação crescente da coluna (ausentes no fim)
+    serie = base.colunas_pandas([coluna])[coluna]
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype(str)
+    return {
+        'postos': serie.rank(method='first', na_option='bottom').to_numpy(dtype=np.int32),
+        'ausentes': serie.isna().to_numpy(),
+    }
+
+
+class TabelaPaginada:
+    def __init__(self, base):
+        self.base = base
+        self.colunas = [c for c in COLUNAS_TABELA if c in base.columns]
+
+        # Com os postos, ordenar um resultado vira um argsort de inteiros sobre as linhas filtradas
+        self.postos = {}
+        self.ausentes = {}
+        for coluna in self.colunas:
+            arrays = base.derivado(f'posto {coluna}', lambda: postos_coluna(base, coluna), VERSAO_POSTOS)
+            self.postos[coluna] = arrays['postos']
+            self.ausentes[coluna] = arrays['ausentes']
+
+    def ordenar(self, ids, coluna, crescente=True):
+        if ids is None:
+            ids = np.arange(len(self.base))
+        postos = self.postos[coluna][ids]
+        if not crescente:
+            # Valores ausentes continuam no fim também na ordem decrescente
+            postos = np.where(self.ausentes[coluna][ids], postos, -postos)
+        ordem = np.argsort(postos, kind='stable')
+        return ids[ordem]
+
+    def pagina(self, ids_ordenados, numero, tamanho):
+        # Só as linhas da página são materializadas e formatadas
+        janela = self.base.linhas(ids_ordenados[(numero - 1) * tamanho:numero * tamanho], self.colunas)
+        for coluna in FORMATO_TABELA:
+            if coluna in janela.columns:
+                janela[coluna] = formatar_reais(janela[coluna]).to_numpy()
+        return janela.reset_index(drop=True)
+
+
+@st.cache_resource
+def carregar_tabela(ano=ANO_ELEICAO):
+    return TabelaPaginada(carregar_candidatos(ano))
+
+
+def exibir_tabela(cargo, ids, altura=600, ano=ANO_ELEICAO):
+    # Controles de ordenação e página, tabela da janela visível e download do resultado completo
+    tabela = carregar_tabela(ano)
+    total = len(tabela.base) if ids is None else len(ids)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        coluna = st.selectbox('Ordenar por', tabela.colunas, key=f'ordem_{cargo}')
+    with col2:
+        crescente = st.radio('Ordem', ['Crescente', 'Decrescente'], horizontal=True, key=f'sentido_{cargo}') == 'Crescente'
+    with col3:
+        tamanho = st.selectbox('Linhas por página', TAMANHOS_PAGINA, index=1, key=f'tamanho_{cargo}')
+    paginas = max(1, -(-total // tamanho))
+
+    # Um filtro novo pode reduzir o número de páginas abaixo da página atual
+    chave_pagina = f'pagina_{cargo}'
+    if st.session_state.get(chave_pagina, 1) > paginas:
+        st.session_state[chave_pagina] = paginas
+    with col4:
+        numero = st.number_input(f'Página (de {paginas})', min_value=1, max_value=paginas, key=chave_pagina)
+
+    with medir('tabela: ordenação'):
+        ids_ordenados = tabela.ordenar(ids, coluna, crescente)
+    with medir('tabela: página e formatação'):
+        janela = tabela.pagina(ids_ordenados, numero, tamanho)
+    with medir('tabela: envio'):
+        st.dataframe(janela, height=altura)
+    st.caption(f'Exibindo {min(tamanho, total - (numero - 1) * tamanho)} de {total} candidaturas.')
+
+    # O arquivo completo só é gerado quando o usuário clica no botão
+    exibir_exportacao(cargo, tabela, ids_ordenados, ano)